@@ -19,7 +19,7 @@ import yaml
 from typing import List, Dict, Any, Optional
 
 from fastapi import FastAPI, Request, Header, HTTPException, Depends, status
-from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import ValidationError
@@ -52,7 +52,8 @@ from toolify_core.capability_detector import (
     DetectorFactory,
     OpenAICapabilityDetector,
     AnthropicCapabilityDetector,
-    GeminiCapabilityDetector
+    GeminiCapabilityDetector,
+    shutdown_shared_client
 )
 
 # Backward compatibility - keep old adapter functions
@@ -1841,11 +1842,13 @@ async def gemini_stream_generate_content(
                 # Convert response back if needed
                 if upstream.get("service_type") != "gemini":
                     logger.info(f"🔄 Converting response from {upstream.get('service_type')} to Gemini format")
-                    from toolify_core.converters import convert_response
-                    conversion = convert_response(upstream["service_type"], "gemini", response_data, model_id)
+                    from toolify_core.converters import convert_response_to_bytes
+                    # Convert and encode in one step; the body is forwarded as-is
+                    conversion = convert_response_to_bytes(upstream["service_type"], "gemini", response_data, model_id)
                     if conversion.success:
                         logger.info(f"✅ Conversion successful")
-                        response_data = conversion.data
+                        logger.debug(f"📦 Final response: {conversion.data[:500].decode('utf-8', 'replace')}")
+                        return Response(content=conversion.data, media_type="application/json")
                     else:
                         logger.error(f"❌ Response conversion failed: {conversion.error}")
                         # Return original data as fallback
@@ -1935,7 +1938,8 @@ async def detect_capabilities(
         
         # Run detection
         logger.info(f"Starting capability detection for {provider}")
-        report = await detector.detect_all_capabilities()
+        async with detector:
+            report = await detector.detect_all_capabilities()
         
         return JSONResponse(content=report.to_dict())
         
@@ -1983,6 +1987,7 @@ async def shutdown_event():
     """Shutdown event - cleanup"""
     logger.info("👋 Server shutting down...")
     await http_client.aclose()
+    await shutdown_shared_client()
 
 
 def main():
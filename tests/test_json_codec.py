@@ -0,0 +1,39 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Toolify: Empower any LLM with function calling capabilities.
+# Copyright (C) 2025 FunnyCups (https://github.com/funnycups)
+
+"""
+Tests for the shared JSON codec.
+"""
+
+import json
+import unittest
+
+from toolify_core.json_codec import json_dumps, json_dumps_bytes, json_loads
+
+
+class JsonCodecIntegerBoundaryTest(unittest.TestCase):
+    """Integers just outside orjson's exact range must round-trip unchanged"""
+
+    BOUNDARIES = (-2**63 - 1, -2**63, 2**64 - 1, 2**64)
+
+    def test_loads_keeps_exact_integers(self):
+        for value in self.BOUNDARIES:
+            with self.subTest(value=value):
+                text = str(value)
+                for data in (text, text.encode("utf-8"), f'{{"n":{text}}}'):
+                    expected = json.loads(data)
+                    result = json_loads(data)
+                    self.assertEqual(result, expected)
+                    self.assertIs(type(result), type(expected))
+
+    def test_dumps_encodes_exact_integers(self):
+        for value in self.BOUNDARIES:
+            with self.subTest(value=value):
+                self.assertEqual(json_dumps({"n": value}), f'{{"n":{value}}}')
+                self.assertEqual(json_dumps_bytes([value]), f"[{value}]".encode("utf-8"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -8,7 +8,12 @@ Capability detection for AI providers.
 Detects support for various features across OpenAI, Anthropic, and Gemini.
 """
 
-from .base_detector import BaseCapabilityDetector, CapabilityResult
+from .base_detector import (
+    BaseCapabilityDetector,
+    CapabilityDetectorProtocol,
+    CapabilityResult,
+    shutdown_shared_client,
+)
 from .detector_factory import DetectorFactory
 from .openai_detector import OpenAICapabilityDetector
 from .anthropic_detector import AnthropicCapabilityDetector
@@ -16,10 +21,12 @@ from .gemini_detector import GeminiCapabilityDetector
 
 __all__ = [
     'BaseCapabilityDetector',
+    'CapabilityDetectorProtocol',
     'CapabilityResult',
     'DetectorFactory',
     'OpenAICapabilityDetector',
     'AnthropicCapabilityDetector',
     'GeminiCapabilityDetector',
+    'shutdown_shared_client',
 ]
 
@@ -7,8 +7,8 @@
 Anthropic capability detector.
 """
 
-import httpx
 import logging
+from typing import Dict, Optional
 from .base_detector import BaseCapabilityDetector, CapabilityResult, DetectionReport, CapabilityStatus
 
 logger = logging.getLogger(__name__)
@@ -17,6 +17,10 @@ logger = logging.getLogger(__name__)
 class AnthropicCapabilityDetector(BaseCapabilityDetector):
     """Detector for Anthropic API capabilities"""
     
+    def __init__(self, api_key: str, base_url: Optional[str] = None, model: Optional[str] = None):
+        super().__init__(api_key, base_url, model)
+        self._messages_url = f"{self.base_url}/v1/messages"
+    
     def get_provider_name(self) -> str:
         return "anthropic"
     
@@ -26,6 +30,12 @@ class AnthropicCapabilityDetector(BaseCapabilityDetector):
     def get_default_model(self) -> str:
         return "claude-3-5-sonnet-20241022"
     
+    def _default_headers(self) -> Dict[str, str]:
+        return {
+            "x-api-key": self.api_key,
+            "anthropic-version": "2023-06-01"
+        }
+    
     async def detect_all_capabilities(self) -> DetectionReport:
         """Detect all Anthropic capabilities"""
         logger.info(f"Starting capability detection for Anthropic (model: {self.model})")
@@ -49,112 +59,100 @@ class AnthropicCapabilityDetector(BaseCapabilityDetector):
     async def test_basic_chat(self) -> CapabilityResult:
         """Test basic chat completion"""
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.post(
-                    f"{self.base_url}/v1/messages",
-                    headers={
-                        "x-api-key": self.api_key,
-                        "anthropic-version": "2023-06-01"
-                    },
-                    json={
-                        "model": self.model,
-                        "messages": [{"role": "user", "content": "Hello, test!"}],
-                        "max_tokens": 50
-                    }
+            response = await self._post_probe(
+                self._messages_url,
+                payload={
+                    "model": self.model,
+                    "messages": [{"role": "user", "content": "Hello, test!"}],
+                    "max_tokens": 50
+                }
+            )
+            
+            if response.status_code == 200:
+                data = response.json()
+                return self._create_success_result(
+                    "basic_chat",
+                    details={"model": data.get("model"), "type": data.get("type")}
                 )
-                
+            else:
+                return self._create_failure_result(
+                    "basic_chat",
+                    f"API returned {response.status_code}"
+                )
+        except Exception as e:
+            return self._create_error_result("basic_chat", e)
+    
+    async def test_streaming(self) -> CapabilityResult:
+        """Test streaming responses"""
+        try:
+            client = await self._get_client()
+            async with client.stream(
+                "POST",
+                self._messages_url,
+                headers=self._headers,
+                timeout=self.timeout,
+                json={
+                    "model": self.model,
+                    "messages": [{"role": "user", "content": "Count to 3"}],
+                    "max_tokens": 50,
+                    "stream": True
+                }
+            ) as response:
                 if response.status_code == 200:
-                    data = response.json()
+                    chunk_count = 0
+                    async for _ in response.aiter_lines():
+                        chunk_count += 1
+                        if chunk_count >= 3:
+                            break
+                    
                     return self._create_success_result(
-                        "basic_chat",
-                        details={"model": data.get("model"), "type": data.get("type")}
+                        "streaming",
+                        details={"chunks_received": chunk_count}
                     )
                 else:
                     return self._create_failure_result(
-                        "basic_chat",
+                        "streaming",
                         f"API returned {response.status_code}"
                     )
-        except Exception as e:
-            return self._create_error_result("basic_chat", e)
-    
-    async def test_streaming(self) -> CapabilityResult:
-        """Test streaming responses"""
-        try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                async with client.stream(
-                    "POST",
-                    f"{self.base_url}/v1/messages",
-                    headers={
-                        "x-api-key": self.api_key,
-                        "anthropic-version": "2023-06-01"
-                    },
-                    json={
-                        "model": self.model,
-                        "messages": [{"role": "user", "content": "Count to 3"}],
-                        "max_tokens": 50,
-                        "stream": True
-                    }
-                ) as response:
-                    if response.status_code == 200:
-                        chunk_count = 0
-                        async for _ in response.aiter_lines():
-                            chunk_count += 1
-                            if chunk_count >= 3:
-                                break
-                        
-                        return self._create_success_result(
-                            "streaming",
-                            details={"chunks_received": chunk_count}
-                        )
-                    else:
-                        return self._create_failure_result(
-                            "streaming",
-                            f"API returned {response.status_code}"
-                        )
         except Exception as e:
             return self._create_error_result("streaming", e)
     
     async def test_function_calling(self) -> CapabilityResult:
         """Test tool use (Anthropic's function calling)"""
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.post(
-                    f"{self.base_url}/v1/messages",
-                    headers={
-                        "x-api-key": self.api_key,
-                        "anthropic-version": "2023-06-01"
-                    },
-                    json={
-                        "model": self.model,
-                        "messages": [{"role": "user", "content": "What's the weather in SF?"}],
-                        "max_tokens": 200,
-                        "tools": [{
-                            "name": "get_weather",
-                            "description": "Get weather",
-                            "input_schema": {
-                                "type": "object",
-                                "properties": {
-                                    "location": {"type": "string"}
-                                }
+            response = await self._post_probe(
+                self._messages_url,
+                payload={
+                    "model": self.model,
+                    "messages": [{"role": "user", "content": "What's the weather in SF?"}],
+                    "max_tokens": 200,
+                    "tools": [{
+                        "name": "get_weather",
+                        "description": "Get weather",
+                        "input_schema": {
+                            "type": "object",
+                            "properties": {
+                                "location": {"type": "string"}
                             }
-                        }]
-                    }
-                )
+                        }
+                    }]
+                }
+            )
+            
+            if response.status_code == 200:
+                data = response.json()
+                content = data.get("content", [])
+                has_tool_use = any(c.get("type") == "tool_use" for c in content)
                 
-                if response.status_code == 200:
-                    data = response.json()
-                    content = data.get("content", [])
-                    has_tool_use = any(c.get("type") == "tool_use" for c in content)
-                    
-                    return self._create_success_result(
-                        "function_calling",
-                        details={"tool_use_detected": has_tool_use}
-                    )
-                else:
-                    return self._create_failure_result(
-                        "function_calling",
-                        f"API returned {response.status_code}"
-                    )
+                return self._create_success_result(
+                    "function_calling",
+                    details={"tool_use_detected": has_tool_use}
+                )
+            else:
+                return self._create_failure_result(
+                    "function_calling",
+                    f"API returned {response.status_code}"
+                )
         except Exception as e:
             return self._create_error_result("function_calling", e)
     
@@ -178,28 +176,23 @@ class AnthropicCapabilityDetector(BaseCapabilityDetector):
     async def test_system_message(self) -> CapabilityResult:
         """Test system message support"""
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.post(
-                    f"{self.base_url}/v1/messages",
-                    headers={
-                        "x-api-key": self.api_key,
-                        "anthropic-version": "2023-06-01"
-                    },
-                    json={
-                        "model": self.model,
-                        "system": "You are helpful",
-                        "messages": [{"role": "user", "content": "Hi"}],
-                        "max_tokens": 50
-                    }
+            response = await self._post_probe(
+                self._messages_url,
+                payload={
+                    "model": self.model,
+                    "system": "You are helpful",
+                    "messages": [{"role": "user", "content": "Hi"}],
+                    "max_tokens": 50
+                }
+            )
+            
+            if response.status_code == 200:
+                return self._create_success_result("system_message")
+            else:
+                return self._create_failure_result(
+                    "system_message",
+                    f"API returned {response.status_code}"
                 )
-                
-                if response.status_code == 200:
-                    return self._create_success_result("system_message")
-                else:
-                    return self._create_failure_result(
-                        "system_message",
-                        f"API returned {response.status_code}"
-                    )
         except Exception as e:
             return self._create_error_result("system_message", e)
 
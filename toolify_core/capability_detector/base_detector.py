@@ -8,14 +8,29 @@ Base capability detector.
 All provider-specific detectors should inherit from this class.
 """
 
-from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Any
+from http.cookiejar import CookieJar, DefaultCookiePolicy
+from typing import Dict, List, Optional, Any, Protocol
 from enum import Enum
+import asyncio
+import httpx
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Connection pool shared by every detector instance; httpx pools per host internally
+_shared_client: Optional[httpx.AsyncClient] = None
+_shared_lock = asyncio.Lock()
+
+
+async def shutdown_shared_client():
+    """Close the shared detector HTTP client, if it has been created"""
+    global _shared_client
+    async with _shared_lock:
+        if _shared_client is not None:
+            await _shared_client.aclose()
+            _shared_client = None
+
 
 class CapabilityStatus(Enum):
     """Capability support status"""
@@ -72,10 +87,37 @@ class DetectionReport:
         }
 
 
-class BaseCapabilityDetector(ABC):
+class CapabilityDetectorProtocol(Protocol):
+    """Structural interface implemented by every capability detector"""
+    
+    api_key: str
+    base_url: str
+    model: str
+    
+    def get_provider_name(self) -> str: ...
+    
+    def get_default_base_url(self) -> str: ...
+    
+    def get_default_model(self) -> str: ...
+    
+    async def detect_all_capabilities(self) -> DetectionReport: ...
+    
+    async def test_basic_chat(self) -> CapabilityResult: ...
+    
+    async def test_streaming(self) -> CapabilityResult: ...
+    
+    async def test_function_calling(self) -> CapabilityResult: ...
+    
+    async def test_vision(self) -> CapabilityResult: ...
+
+
+class BaseCapabilityDetector:
     """
     Base class for capability detection.
     Each detector tests specific AI provider capabilities.
+    
+    This is a plain class rather than an ABC to keep instantiation cheap;
+    subclasses must override every method that raises NotImplementedError.
     """
     
     def __init__(self, api_key: str, base_url: Optional[str] = None, model: Optional[str] = None):
@@ -91,23 +133,82 @@ class BaseCapabilityDetector(ABC):
         self.base_url = base_url or self.get_default_base_url()
         self.model = model or self.get_default_model()
         self.timeout = 30
+        self._headers = self._default_headers()
+        self._client: Optional[httpx.AsyncClient] = None
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
+    
+    async def aclose(self):
+        """
+        Release this detector's handle on the pooled client.
+        The pool itself is shared and is only closed by shutdown_shared_client().
+        """
+        self._client = None
+    
+    def _default_headers(self) -> Dict[str, str]:
+        """
+        Return provider auth headers, built once per detector.
+        The pooled client is shared across API keys, so these are sent per request.
+        """
+        return {}
+    
+    async def _get_client(self) -> httpx.AsyncClient:
+        """
+        Return the module-wide pooled HTTP client, creating it on first use.
+        
+        The client is shared by detectors probing with different API keys, so its
+        cookie jar rejects every cookie; otherwise a cookie set in response to one
+        key's probe would be sent with later probes for other keys.
+        """
+        global _shared_client
+        if self._client is not None and not self._client.is_closed:
+            return self._client
+        async with _shared_lock:
+            if _shared_client is None:
+                _shared_client = httpx.AsyncClient(
+                    limits=httpx.Limits(max_keepalive_connections=64, max_connections=128),
+                    cookies=CookieJar(policy=DefaultCookiePolicy(allowed_domains=[]))
+                )
+            self._client = _shared_client
+            return self._client
+    
+    async def _post_probe(
+        self,
+        url: str,
+        payload: Dict[str, Any]
+    ) -> httpx.Response:
+        """
+        POST a probe request and download the body only on success.
+        
+        Error bodies (often large HTML pages from proxies) are discarded unread,
+        so callers must only access response content when status_code == 200.
+        """
+        client = await self._get_client()
+        request = client.build_request("POST", url, headers=self._headers, json=payload, timeout=self.timeout)
+        response = await client.send(request, stream=True)
+        try:
+            if response.status_code == 200:
+                await response.aread()
+        finally:
+            await response.aclose()
+        return response
     
-    @abstractmethod
     def get_provider_name(self) -> str:
         """Return the provider name"""
-        pass
+        raise NotImplementedError
     
-    @abstractmethod
     def get_default_base_url(self) -> str:
         """Return the default base URL for this provider"""
-        pass
+        raise NotImplementedError
     
-    @abstractmethod
     def get_default_model(self) -> str:
         """Return the default model for testing"""
-        pass
+        raise NotImplementedError
     
-    @abstractmethod
     async def detect_all_capabilities(self) -> DetectionReport:
         """
         Detect all capabilities for this provider.
@@ -115,27 +216,23 @@ class BaseCapabilityDetector(ABC):
         Returns:
             DetectionReport with all capability results
         """
-        pass
+        raise NotImplementedError
     
-    @abstractmethod
     async def test_basic_chat(self) -> CapabilityResult:
         """Test basic chat completion"""
-        pass
+        raise NotImplementedError
     
-    @abstractmethod
     async def test_streaming(self) -> CapabilityResult:
         """Test streaming responses"""
-        pass
+        raise NotImplementedError
     
-    @abstractmethod
     async def test_function_calling(self) -> CapabilityResult:
         """Test function calling / tool use"""
-        pass
+        raise NotImplementedError
     
-    @abstractmethod
     async def test_vision(self) -> CapabilityResult:
         """Test vision / image understanding"""
-        pass
+        raise NotImplementedError
     
     def _create_success_result(self, capability_name: str, details: Optional[Dict] = None) -> CapabilityResult:
         """Helper to create success result"""
@@ -15,7 +15,15 @@ logger = logging.getLogger(__name__)
 
 
 class DetectorFactory:
-    """Factory for creating capability detectors"""
+    """
+    Factory for creating capability detectors.
+    
+    Detectors are async context managers and should be used as
+    ``async with DetectorFactory.create_detector(...) as detector:``.
+    Leaving the block releases the detector's handle on the connection pool,
+    which is shared by all detectors and closed by shutdown_shared_client()
+    on application shutdown.
+    """
     
     _detector_classes: Dict[str, type] = {}
     
@@ -52,11 +60,10 @@ class DetectorFactory:
             Detector instance or None if not found
         """
         detector_class = cls._detector_classes.get(provider)
-        if detector_class:
-            return detector_class(api_key, base_url, model)
-        else:
+        if detector_class is None:
             logger.error(f"No detector registered for provider: {provider}")
             return None
+        return detector_class(api_key, base_url, model)
     
     @classmethod
     def get_supported_providers(cls) -> list:
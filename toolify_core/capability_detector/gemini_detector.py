@@ -7,16 +7,26 @@
 Gemini capability detector.
 """
 
-import httpx
+import asyncio
 import logging
+from typing import Optional
+
 from .base_detector import BaseCapabilityDetector, CapabilityResult, DetectionReport, CapabilityStatus
 
+from ..json_codec import json_loads
+
 logger = logging.getLogger(__name__)
 
 
 class GeminiCapabilityDetector(BaseCapabilityDetector):
     """Detector for Gemini API capabilities"""
     
+    def __init__(self, api_key: str, base_url: Optional[str] = None, model: Optional[str] = None):
+        super().__init__(api_key, base_url, model)
+        # Gemini authenticates via the ?key= query parameter, so bake it into the URLs once
+        self._generate_url = f"{self.base_url}/models/{self.model}:generateContent?key={self.api_key}"
+        self._stream_url = f"{self.base_url}/models/{self.model}:streamGenerateContent?alt=sse&key={self.api_key}"
+    
     def get_provider_name(self) -> str:
         return "gemini"
     
@@ -30,12 +40,21 @@ class GeminiCapabilityDetector(BaseCapabilityDetector):
         """Detect all Gemini capabilities"""
         logger.info(f"Starting capability detection for Gemini (model: {self.model})")
         
-        capabilities = []
-        capabilities.append(await self.test_basic_chat())
-        capabilities.append(await self.test_streaming())
-        capabilities.append(await self.test_function_calling())
-        capabilities.append(await self.test_vision())
-        capabilities.append(await self.test_system_message())
+        # The three generateContent probes are independent, so issue them in one
+        # concurrent round-trip instead of three sequential ones
+        basic_chat, function_calling, system_message = await asyncio.gather(
+            self.test_basic_chat(),
+            self.test_function_calling(),
+            self.test_system_message()
+        )
+        
+        capabilities = [
+            basic_chat,
+            await self.test_streaming(),
+            function_calling,
+            await self.test_vision(),
+            system_message
+        ]
         
         report = DetectionReport(
             provider=self.get_provider_name(),
@@ -49,105 +68,104 @@ class GeminiCapabilityDetector(BaseCapabilityDetector):
     async def test_basic_chat(self) -> CapabilityResult:
         """Test basic chat completion"""
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.post(
-                    f"{self.base_url}/models/{self.model}:generateContent?key={self.api_key}",
-                    json={
-                        "contents": [{
-                            "parts": [{"text": "Hello, test!"}]
-                        }]
-                    }
+            response = await self._post_probe(
+                self._generate_url,
+                payload={
+                    "contents": [{
+                        "parts": [{"text": "Hello, test!"}]
+                    }]
+                }
+            )
+            
+            if response.status_code == 200:
+                data = json_loads(response.content)
+                return self._create_success_result(
+                    "basic_chat",
+                    details={"model": data.get("modelVersion")}
                 )
-                
+            else:
+                return self._create_failure_result(
+                    "basic_chat",
+                    f"API returned {response.status_code}"
+                )
+        except Exception as e:
+            return self._create_error_result("basic_chat", e)
+    
+    async def test_streaming(self) -> CapabilityResult:
+        """Test streaming responses"""
+        try:
+            client = await self._get_client()
+            async with client.stream(
+                "POST",
+                self._stream_url,
+                timeout=self.timeout,
+                json={
+                    "contents": [{
+                        "parts": [{"text": "Count to 3"}]
+                    }]
+                }
+            ) as response:
                 if response.status_code == 200:
-                    data = response.json()
+                    chunk_count = 0
+                    async for _ in response.aiter_lines():
+                        chunk_count += 1
+                        if chunk_count >= 3:
+                            break
+                    
                     return self._create_success_result(
-                        "basic_chat",
-                        details={"model": data.get("modelVersion")}
+                        "streaming",
+                        details={"chunks_received": chunk_count}
                     )
                 else:
                     return self._create_failure_result(
-                        "basic_chat",
+                        "streaming",
                         f"API returned {response.status_code}"
                     )
-        except Exception as e:
-            return self._create_error_result("basic_chat", e)
-    
-    async def test_streaming(self) -> CapabilityResult:
-        """Test streaming responses"""
-        try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                async with client.stream(
-                    "POST",
-                    f"{self.base_url}/models/{self.model}:streamGenerateContent?alt=sse&key={self.api_key}",
-                    json={
-                        "contents": [{
-                            "parts": [{"text": "Count to 3"}]
-                        }]
-                    }
-                ) as response:
-                    if response.status_code == 200:
-                        chunk_count = 0
-                        async for _ in response.aiter_lines():
-                            chunk_count += 1
-                            if chunk_count >= 3:
-                                break
-                        
-                        return self._create_success_result(
-                            "streaming",
-                            details={"chunks_received": chunk_count}
-                        )
-                    else:
-                        return self._create_failure_result(
-                            "streaming",
-                            f"API returned {response.status_code}"
-                        )
         except Exception as e:
             return self._create_error_result("streaming", e)
     
     async def test_function_calling(self) -> CapabilityResult:
         """Test function declarations"""
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.post(
-                    f"{self.base_url}/models/{self.model}:generateContent?key={self.api_key}",
-                    json={
-                        "contents": [{
-                            "parts": [{"text": "What's the weather in SF?"}]
-                        }],
-                        "tools": [{
-                            "functionDeclarations": [{
-                                "name": "get_weather",
-                                "description": "Get weather",
-                                "parameters": {
-                                    "type": "object",
-                                    "properties": {
-                                        "location": {"type": "string"}
-                                    }
+            response = await self._post_probe(
+                self._generate_url,
+                payload={
+                    "contents": [{
+                        "parts": [{"text": "What's the weather in SF?"}]
+                    }],
+                    "tools": [{
+                        "functionDeclarations": [{
+                            "name": "get_weather",
+                            "description": "Get weather",
+                            "parameters": {
+                                "type": "object",
+                                "properties": {
+                                    "location": {"type": "string"}
                                 }
-                            }]
+                            }
                         }]
-                    }
-                )
+                    }]
+                }
+            )
+            
+            if response.status_code == 200:
+                data = json_loads(response.content)
+                candidates = data.get("candidates", [])
+                has_function_call = False
                 
-                if response.status_code == 200:
-                    data = response.json()
-                    candidates = data.get("candidates", [])
-                    has_function_call = False
-                    
-                    if candidates:
-                        parts = candidates[0].get("content", {}).get("parts", [])
-                        has_function_call = any("functionCall" in p for p in parts)
-                    
-                    return self._create_success_result(
-                        "function_calling",
-                        details={"function_call_detected": has_function_call}
-                    )
-                else:
-                    return self._create_failure_result(
-                        "function_calling",
-                        f"API returned {response.status_code}"
-                    )
+                if candidates:
+                    parts = candidates[0].get("content", {}).get("parts", [])
+                    has_function_call = any("functionCall" in p for p in parts)
+                
+                return self._create_success_result(
+                    "function_calling",
+                    details={"function_call_detected": has_function_call}
+                )
+            else:
+                return self._create_failure_result(
+                    "function_calling",
+                    f"API returned {response.status_code}"
+                )
         except Exception as e:
             return self._create_error_result("function_calling", e)
     
@@ -162,26 +180,25 @@ class GeminiCapabilityDetector(BaseCapabilityDetector):
     async def test_system_message(self) -> CapabilityResult:
         """Test system instruction support"""
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.post(
-                    f"{self.base_url}/models/{self.model}:generateContent?key={self.api_key}",
-                    json={
-                        "systemInstruction": {
-                            "parts": [{"text": "You are helpful"}]
-                        },
-                        "contents": [{
-                            "parts": [{"text": "Hi"}]
-                        }]
-                    }
+            response = await self._post_probe(
+                self._generate_url,
+                payload={
+                    "systemInstruction": {
+                        "parts": [{"text": "You are helpful"}]
+                    },
+                    "contents": [{
+                        "parts": [{"text": "Hi"}]
+                    }]
+                }
+            )
+            
+            if response.status_code == 200:
+                return self._create_success_result("system_message")
+            else:
+                return self._create_failure_result(
+                    "system_message",
+                    f"API returned {response.status_code}"
                 )
-                
-                if response.status_code == 200:
-                    return self._create_success_result("system_message")
-                else:
-                    return self._create_failure_result(
-                        "system_message",
-                        f"API returned {response.status_code}"
-                    )
         except Exception as e:
             return self._create_error_result("system_message", e)
 
@@ -13,6 +13,7 @@ from .converter_factory import (
     ConverterFactory,
     convert_request,
     convert_response,
+    convert_response_to_bytes,
     convert_streaming_chunk
 )
 from .openai_converter import OpenAIConverter
@@ -25,6 +26,7 @@ __all__ = [
     'ConverterFactory',
     'convert_request',
     'convert_response',
+    'convert_response_to_bytes',
     'convert_streaming_chunk',
     'OpenAIConverter',
     'AnthropicConverter',
@@ -8,21 +8,103 @@ Anthropic format converter.
 Enhanced version that integrates existing anthropic_adapter functionality.
 """
 
-import json
 import time
-import uuid
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from datetime import datetime
 import logging
 
-from .base_converter import BaseConverter, ConversionResult
+from .base_converter import BaseConverter, ConversionResult, EMPTY_MAPPING, fast_uuid_hex
+from ..json_codec import json_loads
 
 logger = logging.getLogger(__name__)
 
+# Finish-reason and role mappings, hoisted so they are not rebuilt per response
+_OPENAI_STOP_REASON_MAP = {
+    "stop": "end_turn",
+    "length": "max_tokens",
+    "tool_calls": "tool_use",
+    "content_filter": "end_turn"
+}
+
+_GEMINI_STOP_REASON_MAP = {
+    "STOP": "end_turn",
+    "MAX_TOKENS": "max_tokens",
+    "SAFETY": "end_turn",
+    "RECITATION": "end_turn"
+}
+
+_GEMINI_ROLE_MAP = {"user": "user", "assistant": "model"}
+
+# Anthropic request parameter -> OpenAI request parameter
+_OPENAI_PARAM_MAP = (
+    ("max_tokens", "max_tokens"),
+    ("temperature", "temperature"),
+    ("top_p", "top_p"),
+    ("stop_sequences", "stop")
+)
+
+# Anthropic request parameter -> Gemini generationConfig key
+_GEMINI_GEN_MAP = (
+    ("max_tokens", "maxOutputTokens"),
+    ("temperature", "temperature"),
+    ("top_p", "topP"),
+    ("stop_sequences", "stopSequences")
+)
+
+def _tool_call_to_tool_use(tool_call: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert an OpenAI function tool_call to an Anthropic tool_use block"""
+    function = tool_call["function"]
+    try:
+        args = json_loads(function.get("arguments") or "{}")
+    except ValueError:  # json.JSONDecodeError subclasses ValueError
+        args = {}
+    
+    return {
+        "type": "tool_use",
+        "id": tool_call.get("id") or f"toolu_{fast_uuid_hex()}",
+        "name": function.get("name", ""),
+        "input": args
+    }
+
+
+def _gemini_image_part(block: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Convert an Anthropic image block to a Gemini inline_data part (base64 only)"""
+    source = block.get("source", {})
+    if source.get("type") != "base64":
+        return None
+    return {
+        "inline_data": {
+            "mime_type": source.get("media_type", "image/png"),
+            "data": source.get("data", "")
+        }
+    }
+
+
+# Anthropic content block type -> Gemini part builder
+_GEMINI_BLOCK_HANDLERS = {
+    "text": lambda block: {"text": block.get("text", "")},
+    "image": _gemini_image_part
+}
+
 
 class AnthropicConverter(BaseConverter):
     """Converter for Anthropic format"""
     
+    __slots__ = ("_req_dispatch", "_resp_dispatch")
+    
+    def __init__(self):
+        super().__init__()
+        # Format dispatch tables, built once so each call is a single dict lookup;
+        # same-format passthrough is handled before the lookup
+        self._req_dispatch = {
+            "openai": self._convert_to_openai_request,
+            "gemini": self._convert_to_gemini_request
+        }
+        self._resp_dispatch = {
+            "openai": self._convert_from_openai_response,
+            "gemini": self._convert_from_gemini_response
+        }
+    
     def get_format_name(self) -> str:
         return "anthropic"
     
@@ -33,273 +115,230 @@ class AnthropicConverter(BaseConverter):
         headers: Optional[Dict[str, str]] = None
     ) -> ConversionResult:
         """Convert Anthropic request to target format"""
+        if target_format == self._format_name:
+            return ConversionResult.passthrough(data)
+        handler = self._req_dispatch.get(target_format)
+        if handler is None:
+            return ConversionResult(
+                success=False,
+                error=f"Unsupported target format: {target_format}"
+            )
         try:
-            if target_format == "anthropic":
-                return ConversionResult(success=True, data=data)
-            elif target_format == "openai":
-                return self._convert_to_openai_request(data)
-            elif target_format == "gemini":
-                return self._convert_to_gemini_request(data)
-            else:
-                return ConversionResult(
-                    success=False,
-                    error=f"Unsupported target format: {target_format}"
-                )
+            return handler(data)
         except Exception as e:
-            logger.error(f"Request conversion failed: {e}")
+            logger.error("Request conversion failed: %s", e)
             return ConversionResult(success=False, error=str(e))
     
     def convert_response(
         self,
         data: Dict[str, Any],
         source_format: str,
-        target_format: str
+        target_format: str,
+        original_model: Optional[str] = None
     ) -> ConversionResult:
         """Convert response from source format to Anthropic format"""
+        if source_format == self._format_name:
+            return ConversionResult.passthrough(data)
+        handler = self._resp_dispatch.get(source_format)
+        if handler is None:
+            return ConversionResult(
+                success=False,
+                error=f"Unsupported source format: {source_format}"
+            )
         try:
-            if source_format == "anthropic":
-                return ConversionResult(success=True, data=data)
-            elif source_format == "openai":
-                return self._convert_from_openai_response(data)
-            elif source_format == "gemini":
-                return self._convert_from_gemini_response(data)
-            else:
-                return ConversionResult(
-                    success=False,
-                    error=f"Unsupported source format: {source_format}"
-                )
+            return handler(data, original_model or self.original_model)
         except Exception as e:
-            logger.error(f"Response conversion failed: {e}")
+            logger.error("Response conversion failed: %s", e)
             return ConversionResult(success=False, error=str(e))
     
+    @staticmethod
+    def _flatten_system(system_content: Any) -> str:
+        """Flatten an Anthropic system prompt (string or list of text blocks) to text"""
+        if isinstance(system_content, list):
+            # EAFP: blocks are dicts in practice, so skip the per-block isinstance
+            # check and only take the guarded path when a stray non-dict shows up
+            try:
+                return "\n\n".join(
+                    block.get("text", "") for block in system_content
+                    if block.get("type") == "text"
+                )
+            except AttributeError:
+                return "\n\n".join(
+                    block.get("text", "") for block in system_content
+                    if isinstance(block, dict) and block.get("type") == "text"
+                )
+        return system_content or ""
+    
     def _convert_to_openai_request(self, data: Dict) -> ConversionResult:
         """Convert Anthropic request to OpenAI format"""
-        openai_req = {
-            "model": data.get("model", "gpt-4"),
-            "messages": [],
-            "stream": data.get("stream", False)
-        }
-        
         # Handle system message (can be string or array with cache_control)
-        if "system" in data and data["system"]:
-            system_content = data["system"]
-            
-            if isinstance(system_content, list):
-                text_parts = []
-                for block in system_content:
-                    if isinstance(block, dict) and block.get("type") == "text":
-                        text_parts.append(block.get("text", ""))
-                system_text = "\n\n".join(text_parts) if text_parts else ""
-            else:
-                system_text = system_content
-            
-            if system_text:
-                openai_req["messages"].append({
-                    "role": "system",
-                    "content": system_text
-                })
+        system_text = self._flatten_system(data.get("system"))
+        
+        messages = [{"role": "system", "content": system_text}] if system_text else []
         
         # Convert messages
+        append_msg = messages.append
         for msg in data.get("messages", []):
+            role = msg.get("role")
+            content = msg.get("content")
+            
             # Handle tool_result messages
-            if msg.get("role") == "user" and isinstance(msg.get("content"), list):
+            if role == "user" and isinstance(content, list):
+                # Single pass: tool_result blocks become tool messages, text is collected
                 text_parts = []
-                for content_block in msg["content"]:
-                    if content_block.get("type") == "text":
-                        text_parts.append(content_block.get("text", ""))
-                    elif content_block.get("type") == "tool_result":
+                append_text = text_parts.append
+                for content_block in content:
+                    block_type = content_block.get("type")
+                    if block_type == "text":
+                        append_text(content_block.get("text", ""))
+                    elif block_type == "tool_result":
                         # Convert tool_result to tool message
-                        openai_req["messages"].append({
+                        append_msg({
                             "role": "tool",
                             "tool_call_id": content_block.get("tool_use_id", ""),
                             "content": content_block.get("content", "")
                         })
                 if text_parts:
-                    openai_req["messages"].append({
+                    append_msg({
                         "role": "user",
                         "content": " ".join(text_parts)
                     })
             else:
                 # Regular message
-                content = msg.get("content")
                 if isinstance(content, list):
-                    text_parts = [c.get("text", "") for c in content if c.get("type") == "text"]
-                    content = " ".join(text_parts) if text_parts else ""
+                    content = " ".join(c.get("text", "") for c in content if c.get("type") == "text")
                 
-                openai_req["messages"].append({
-                    "role": msg.get("role"),
+                append_msg({
+                    "role": role,
                     "content": content
                 })
         
+        optional_params = {}
+        
         # Convert tools
         if "tools" in data and data["tools"]:
-            openai_tools = []
-            for tool in data["tools"]:
-                openai_tools.append({
+            optional_params["tools"] = [
+                {
                     "type": "function",
                     "function": {
                         "name": tool.get("name", ""),
                         "description": tool.get("description", ""),
                         "parameters": tool.get("input_schema", {})
                     }
-                })
-            openai_req["tools"] = openai_tools
+                }
+                for tool in data["tools"]
+            ]
         
         # Map parameters
-        if "max_tokens" in data:
-            openai_req["max_tokens"] = data["max_tokens"]
-        if "temperature" in data:
-            openai_req["temperature"] = data["temperature"]
-        if "top_p" in data:
-            openai_req["top_p"] = data["top_p"]
-        if "stop_sequences" in data:
-            openai_req["stop"] = data["stop_sequences"]
+        for src, dst in _OPENAI_PARAM_MAP:
+            if src in data:
+                optional_params[dst] = data[src]
+        
+        openai_req = {
+            "model": data.get("model", "gpt-4"),
+            "messages": messages,
+            "stream": data.get("stream", False),
+            **optional_params
+        }
         
         return ConversionResult(success=True, data=openai_req)
     
+    @staticmethod
+    def _to_gemini_parts(content: Any) -> List[Dict[str, Any]]:
+        """Convert Anthropic message content to a list of Gemini parts"""
+        if not isinstance(content, list):
+            # Simple text content
+            return [{"text": content}]
+        
+        # Handle complex content; unknown block types and unsupported images are skipped
+        return [
+            part for block in content
+            if (handler := _GEMINI_BLOCK_HANDLERS.get(block.get("type"))) is not None
+            and (part := handler(block)) is not None
+        ]
+    
     def _convert_to_gemini_request(self, data: Dict) -> ConversionResult:
         """Convert Anthropic request to Gemini format"""
         gemini_req = {"contents": []}
         
         # System instruction
-        if "system" in data and data["system"]:
-            system_content = data["system"]
-            if isinstance(system_content, list):
-                text_parts = []
-                for block in system_content:
-                    if isinstance(block, dict) and block.get("type") == "text":
-                        text_parts.append(block.get("text", ""))
-                system_text = "\n\n".join(text_parts)
-            else:
-                system_text = system_content
-            
-            if system_text:
-                gemini_req["systemInstruction"] = {
-                    "parts": [{"text": system_text}]
-                }
+        system_text = self._flatten_system(data.get("system"))
+        if system_text:
+            gemini_req["systemInstruction"] = {
+                "parts": [{"text": system_text}]
+            }
         
-        # Convert messages
-        for msg in data.get("messages", []):
-            role = "user" if msg.get("role") == "user" else "model"
-            content = msg.get("content")
-            
-            if isinstance(content, list):
-                # Handle complex content
-                parts = []
-                for block in content:
-                    if block.get("type") == "text":
-                        parts.append({"text": block.get("text", "")})
-                    elif block.get("type") == "image":
-                        # Handle image content
-                        source = block.get("source", {})
-                        if source.get("type") == "base64":
-                            parts.append({
-                                "inline_data": {
-                                    "mime_type": source.get("media_type", "image/png"),
-                                    "data": source.get("data", "")
-                                }
-                            })
-                
-                if parts:
-                    gemini_req["contents"].append({"role": role, "parts": parts})
-            else:
-                # Simple text content
-                gemini_req["contents"].append({
-                    "role": role,
-                    "parts": [{"text": content}]
-                })
+        # Convert messages; list content that yields no parts is dropped
+        gemini_req["contents"] = [
+            {"role": _GEMINI_ROLE_MAP.get(msg.get("role"), "model"), "parts": parts}
+            for msg in data.get("messages", [])
+            if (parts := self._to_gemini_parts(msg.get("content")))
+        ]
         
         # Generation config
-        generation_config = {}
-        if "max_tokens" in data:
-            generation_config["maxOutputTokens"] = data["max_tokens"]
-        if "temperature" in data:
-            generation_config["temperature"] = data["temperature"]
-        if "top_p" in data:
-            generation_config["topP"] = data["top_p"]
-        if "stop_sequences" in data:
-            generation_config["stopSequences"] = data["stop_sequences"]
+        generation_config = {
+            dst: data[src] for src, dst in _GEMINI_GEN_MAP if src in data
+        }
         
         if generation_config:
             gemini_req["generationConfig"] = generation_config
         
         # Convert tools
         if "tools" in data and data["tools"]:
-            gemini_tools = []
-            for tool in data["tools"]:
-                gemini_tools.append({
+            gemini_req["tools"] = [
+                {
                     "functionDeclarations": [{
                         "name": tool.get("name", ""),
                         "description": tool.get("description", ""),
                         "parameters": tool.get("input_schema", {})
                     }]
-                })
-            gemini_req["tools"] = gemini_tools
+                }
+                for tool in data["tools"]
+            ]
         
         return ConversionResult(success=True, data=gemini_req)
     
-    def _convert_from_openai_response(self, data: Dict) -> ConversionResult:
+    def _convert_from_openai_response(self, data: Dict, original_model: Optional[str] = None) -> ConversionResult:
         """Convert OpenAI response to Anthropic format"""
-        choice = data.get("choices", [{}])[0]
-        message = choice.get("message", {})
+        # choices[0].message is guaranteed by the API contract; only genuinely
+        # optional fields below go through .get()
+        try:
+            choice = data["choices"][0]
+            message = choice["message"]
+        except (KeyError, IndexError, TypeError):
+            return ConversionResult(success=False, error="Malformed OpenAI response: missing choices[0].message")
         finish_reason = choice.get("finish_reason")
         
-        # Build content array
-        content = []
-        
-        # Add text content
-        if message.get("content"):
-            content.append({
-                "type": "text",
-                "text": message.get("content")
-            })
-        
-        # Convert tool_calls to Anthropic tool_use format
-        if message.get("tool_calls"):
-            for tool_call in message["tool_calls"]:
-                if tool_call.get("type") == "function":
-                    function = tool_call.get("function", {})
-                    try:
-                        args = json.loads(function.get("arguments", "{}"))
-                    except json.JSONDecodeError:
-                        args = {}
-                    
-                    content.append({
-                        "type": "tool_use",
-                        "id": tool_call.get("id", f"toolu_{uuid.uuid4().hex}"),
-                        "name": function.get("name", ""),
-                        "input": args
-                    })
-        
-        # If no content, add empty text
-        if not content:
-            content.append({"type": "text", "text": ""})
+        # Build content array: text first, then tool_use blocks, or a single
+        # empty text block when the message carries neither
+        text = message.get("content")
+        content = ([{"type": "text", "text": text}] if text else []) + [
+            _tool_call_to_tool_use(tool_call)
+            for tool_call in message.get("tool_calls") or ()
+            if tool_call.get("type") == "function"
+        ] or [{"type": "text", "text": ""}]
         
         # Map finish_reason
-        stop_reason_map = {
-            "stop": "end_turn",
-            "length": "max_tokens",
-            "tool_calls": "tool_use",
-            "content_filter": "end_turn"
-        }
-        stop_reason = stop_reason_map.get(finish_reason, "end_turn")
+        stop_reason = _OPENAI_STOP_REASON_MAP.get(finish_reason, "end_turn")
+        
+        usage = data.get("usage", EMPTY_MAPPING)
         
         anthropic_resp = {
-            "id": data.get("id", f"msg_{uuid.uuid4().hex}"),
+            "id": data.get("id") or f"msg_{fast_uuid_hex()}",
             "type": "message",
             "role": "assistant",
             "content": content,
-            "model": self.original_model or data.get("model", ""),
+            "model": original_model or data.get("model", ""),
             "stop_reason": stop_reason,
             "usage": {
-                "input_tokens": data.get("usage", {}).get("prompt_tokens", 0),
-                "output_tokens": data.get("usage", {}).get("completion_tokens", 0)
+                "input_tokens": usage.get("prompt_tokens", 0),
+                "output_tokens": usage.get("completion_tokens", 0)
             }
         }
         
         return ConversionResult(success=True, data=anthropic_resp)
     
-    def _convert_from_gemini_response(self, data: Dict) -> ConversionResult:
+    def _convert_from_gemini_response(self, data: Dict, original_model: Optional[str] = None) -> ConversionResult:
         """Convert Gemini response to Anthropic format"""
         candidates = data.get("candidates", [])
         if not candidates:
@@ -309,7 +348,7 @@ class AnthropicConverter(BaseConverter):
             )
         
         candidate = candidates[0]
-        content_data = candidate.get("content", {})
+        content_data = candidate.get("content", EMPTY_MAPPING)
         parts = content_data.get("parts", [])
         
         # Build content array
@@ -324,7 +363,7 @@ class AnthropicConverter(BaseConverter):
                 func_call = part["functionCall"]
                 content.append({
                     "type": "tool_use",
-                    "id": f"toolu_{uuid.uuid4().hex}",
+                    "id": f"toolu_{fast_uuid_hex()}",
                     "name": func_call.get("name", ""),
                     "input": func_call.get("args", {})
                 })
@@ -333,24 +372,18 @@ class AnthropicConverter(BaseConverter):
             content.append({"type": "text", "text": ""})
         
         # Map finish reason
-        finish_reason_map = {
-            "STOP": "end_turn",
-            "MAX_TOKENS": "max_tokens",
-            "SAFETY": "end_turn",
-            "RECITATION": "end_turn"
-        }
         gemini_reason = candidate.get("finishReason", "STOP")
-        stop_reason = finish_reason_map.get(gemini_reason, "end_turn")
+        stop_reason = _GEMINI_STOP_REASON_MAP.get(gemini_reason, "end_turn")
         
         # Token usage
-        usage_metadata = data.get("usageMetadata", {})
+        usage_metadata = data.get("usageMetadata", EMPTY_MAPPING)
         
         anthropic_resp = {
-            "id": f"msg_{uuid.uuid4().hex}",
+            "id": f"msg_{fast_uuid_hex()}",
             "type": "message",
             "role": "assistant",
             "content": content,
-            "model": self.original_model or data.get("modelVersion", ""),
+            "model": original_model or data.get("modelVersion", ""),
             "stop_reason": stop_reason,
             "usage": {
                 "input_tokens": usage_metadata.get("promptTokenCount", 0),
@@ -8,51 +8,95 @@ Base converter class for format conversion.
 All format converters should inherit from this class.
 """
 
-from abc import ABC, abstractmethod
+import os
 from dataclasses import dataclass
-from typing import Dict, Any, Optional
+from types import MappingProxyType
+from typing import Dict, Any, List, Mapping, Optional
 import logging
 
+from ..json_codec import json_dumps_bytes
+
 logger = logging.getLogger(__name__)
 
+# Immutable default for read-only lookups into nested response fields
+EMPTY_MAPPING: Mapping[str, Any] = MappingProxyType({})
+
+# Pool of pre-generated random hex ids, refilled from a single os.urandom call
+_UUID_POOL_SIZE = 64
+_UUID_POOL: List[str] = []
+
+
+def fast_uuid_hex() -> str:
+    """Return a random 32-char hex id, amortizing urandom calls across the pool"""
+    if not _UUID_POOL:
+        raw = os.urandom(16 * _UUID_POOL_SIZE)
+        _UUID_POOL.extend(raw[i:i + 16].hex() for i in range(0, len(raw), 16))
+    return _UUID_POOL.pop()
 
-@dataclass
+
+@dataclass(slots=True)
 class ConversionResult:
     """Conversion result with success status and data/error"""
     success: bool
     data: Optional[Any] = None
     error: Optional[str] = None
     
-    def __post_init__(self):
-        """Validate conversion result"""
-        if self.success and self.data is None:
-            logger.warning("Successful conversion but data is None")
-        if not self.success and self.error is None:
-            logger.warning("Failed conversion but error is None")
+    @classmethod
+    def passthrough(cls, data: Any) -> "ConversionResult":
+        """
+        Wrap data that needs no conversion as a successful result.
+        
+        Skips the generated __init__ and the debug-only __post_init__ check,
+        since an identity pass can never produce a failed or empty result.
+        """
+        result = cls.__new__(cls)
+        result.success = True
+        result.data = data
+        result.error = None
+        return result
+    
+    if __debug__:
+        # Sanity checks only; compiled out under `python -O` so optimized
+        # deployments construct results without the extra hook call
+        def __post_init__(self):
+            """Validate conversion result"""
+            if self.success and self.data is None:
+                logger.warning("Successful conversion but data is None")
+            if not self.success and self.error is None:
+                logger.warning("Failed conversion but error is None")
 
 
-class BaseConverter(ABC):
+class BaseConverter:
     """
-    Abstract base class for format converters.
+    Base class for format converters.
     
     Each converter handles conversion TO its target format FROM other formats.
     For example, AnthropicConverter converts FROM OpenAI/Gemini TO Anthropic.
+    
+    Subclasses must override every method that raises NotImplementedError.
     """
     
+    __slots__ = ("original_model", "_streaming_state", "_format_name")
+    
     def __init__(self):
         self.original_model: Optional[str] = None
         self._streaming_state = {}
+        self._format_name = self.get_format_name()
     
     def set_original_model(self, model: str):
-        """Set the original model name for response conversion"""
+        """
+        Set a fallback model name for response conversion.
+        
+        Deprecated: converter instances are shared between requests, so state set
+        here leaks across them. Pass original_model to convert_response instead.
+        """
         self.original_model = model
     
     def reset_streaming_state(self):
         """Reset streaming state for new stream"""
         self._streaming_state = {}
-        logger.debug(f"{self.__class__.__name__}: Streaming state reset")
+        logger.debug("%s: Streaming state reset", self.__class__.__name__)
     
-    @abstractmethod
     def convert_request(
         self,
         data: Dict[str, Any],
@@ -70,14 +114,14 @@ class BaseConverter(ABC):
         Returns:
             ConversionResult with converted data or error
         """
-        pass
+        raise NotImplementedError
     
-    @abstractmethod
     def convert_response(
         self,
         data: Dict[str, Any],
         source_format: str,
-        target_format: str
+        target_format: str,
+        original_model: Optional[str] = None
     ) -> ConversionResult:
         """
         Convert response from source format to this converter's format.
@@ -86,16 +130,43 @@ class BaseConverter(ABC):
             data: Response data in source format
             source_format: Source format (openai, anthropic, gemini)
             target_format: This converter's format
+            original_model: Model name from the client request, reported in the response
             
         Returns:
             ConversionResult with converted data or error
         """
-        pass
+        raise NotImplementedError
+    
+    def convert_response_to_bytes(
+        self,
+        data: Dict[str, Any],
+        source_format: str,
+        target_format: str,
+        original_model: Optional[str] = None
+    ) -> ConversionResult:
+        """
+        Convert response and serialize it to JSON bytes in one step.
+        
+        For callers that only forward the body, this skips a second encode
+        pass through the stdlib json module.
+        
+        Returns:
+            ConversionResult whose data is the UTF-8 encoded JSON body
+        """
+        result = self.convert_response(data, source_format, target_format, original_model)
+        if not result.success:
+            return result
+        try:
+            return ConversionResult(success=True, data=json_dumps_bytes(result.data))
+        except (TypeError, ValueError) as e:
+            logger.error("Response serialization failed: %s", e)
+            return ConversionResult(success=False, error=str(e))
     
     def convert_streaming_chunk(
         self,
         data: Dict[str, Any],
-        source_format: str
+        source_format: str,
+        original_model: Optional[str] = None
     ) -> ConversionResult:
         """
         Convert streaming response chunk.
@@ -103,17 +174,21 @@ class BaseConverter(ABC):
         Args:
             data: Chunk data in source format
             source_format: Source format (openai, anthropic, gemini)
+            original_model: Model name from the client request, reported in the chunk
             
         Returns:
             ConversionResult with converted chunk or error
         """
+        # Same format passthrough, before any per-converter dispatch
+        if source_format == self._format_name:
+            return ConversionResult.passthrough(data)
+        
         # Default implementation: use regular response conversion
-        return self.convert_response(data, source_format, self.get_format_name())
+        return self.convert_response(data, source_format, self._format_name, original_model)
     
-    @abstractmethod
     def get_format_name(self) -> str:
         """Return the format name this converter handles"""
-        pass
+        raise NotImplementedError
     
     @staticmethod
     def safe_get(data: Dict, *keys, default=None):
@@ -13,11 +13,15 @@ from .base_converter import BaseConverter, ConversionResult
 
 logger = logging.getLogger(__name__)
 
+# Converter instances by format name; shared with ConverterFactory._converters so the
+# convenience functions below can hit it with a single dict lookup
+_CONVERTER_CACHE: Dict[str, BaseConverter] = {}
+
 
 class ConverterFactory:
     """Factory for creating and managing format converters"""
     
-    _converters: Dict[str, BaseConverter] = {}
+    _converters: Dict[str, BaseConverter] = _CONVERTER_CACHE
     _converter_classes: Dict[str, type] = {}
     
     @classmethod
@@ -25,12 +29,16 @@ class ConverterFactory:
         """
         Register a converter class for a format.
         
+        The converter is instantiated eagerly so conversion calls never pay
+        for lazy creation.
+        
         Args:
             format_name: Format identifier (openai, anthropic, gemini)
             converter_class: Converter class to register
         """
         cls._converter_classes[format_name] = converter_class
-        logger.info(f"Registered converter for format: {format_name}")
+        _CONVERTER_CACHE[format_name] = converter_class()
+        logger.info("Registered converter for format: %s", format_name)
     
     @classmethod
     def get_converter(cls, format_name: str) -> Optional[BaseConverter]:
@@ -43,16 +51,18 @@ class ConverterFactory:
         Returns:
             Converter instance or None if not found
         """
-        if format_name not in cls._converters:
-            converter_class = cls._converter_classes.get(format_name)
-            if converter_class:
-                cls._converters[format_name] = converter_class()
-                logger.debug(f"Created new converter instance for: {format_name}")
-            else:
-                logger.error(f"No converter registered for format: {format_name}")
-                return None
+        converter = _CONVERTER_CACHE.get(format_name)
+        if converter is not None:
+            return converter
         
-        return cls._converters[format_name]
+        converter_class = cls._converter_classes.get(format_name)
+        if converter_class is None:
+            logger.error("No converter registered for format: %s", format_name)
+            return None
+        
+        converter = _CONVERTER_CACHE[format_name] = converter_class()
+        logger.debug("Created new converter instance for: %s", format_name)
+        return converter
     
     @classmethod
     def get_supported_formats(cls) -> list:
@@ -67,7 +77,7 @@ class ConverterFactory:
     @classmethod
     def clear_converters(cls):
         """Clear all converter instances (useful for testing)"""
-        cls._converters.clear()
+        _CONVERTER_CACHE.clear()
         logger.debug("Cleared all converter instances")
 
 
@@ -91,17 +101,13 @@ def convert_request(
     Returns:
         ConversionResult
     """
-    converter = ConverterFactory.get_converter(source_format)
+    converter = _CONVERTER_CACHE.get(source_format) or ConverterFactory.get_converter(source_format)
     if not converter:
         return ConversionResult(
             success=False,
             error=f"Unsupported source format: {source_format}"
         )
     
-    # Set original model if present
-    if hasattr(converter, 'set_original_model') and 'model' in data:
-        converter.set_original_model(data['model'])
-    
     return converter.convert_request(data, target_format, headers)
 
 
@@ -123,18 +129,42 @@ def convert_response(
     Returns:
         ConversionResult
     """
-    converter = ConverterFactory.get_converter(target_format)
+    converter = _CONVERTER_CACHE.get(target_format) or ConverterFactory.get_converter(target_format)
     if not converter:
         return ConversionResult(
             success=False,
             error=f"Unsupported target format: {target_format}"
         )
     
-    # Set original model if provided
-    if hasattr(converter, 'set_original_model') and original_model:
-        converter.set_original_model(original_model)
+    return converter.convert_response(data, source_format, target_format, original_model)
+
+
+def convert_response_to_bytes(
+    source_format: str,
+    target_format: str,
+    data: Dict,
+    original_model: Optional[str] = None
+) -> ConversionResult:
+    """
+    Convert response from source format to target format as JSON bytes.
     
-    return converter.convert_response(data, source_format, target_format)
+    Args:
+        source_format: Source API format
+        target_format: Target API format
+        data: Response data
+        original_model: Original model name from request
+        
+    Returns:
+        ConversionResult with the encoded response body
+    """
+    converter = _CONVERTER_CACHE.get(target_format) or ConverterFactory.get_converter(target_format)
+    if not converter:
+        return ConversionResult(
+            success=False,
+            error=f"Unsupported target format: {target_format}"
+        )
+    
+    return converter.convert_response_to_bytes(data, source_format, target_format, original_model)
 
 
 def convert_streaming_chunk(
@@ -155,28 +185,20 @@ def convert_streaming_chunk(
     Returns:
         ConversionResult
     """
-    logger.debug(f"Converting streaming chunk: {source_format} -> {target_format}")
+    logger.debug("Converting streaming chunk: %s -> %s", source_format, target_format)
     
     # Same format passthrough
     if source_format == target_format:
-        logger.debug(f"Same format, returning data as-is")
-        return ConversionResult(success=True, data=data)
+        logger.debug("Same format, returning data as-is")
+        return ConversionResult.passthrough(data)
     
-    converter = ConverterFactory.get_converter(target_format)
+    converter = _CONVERTER_CACHE.get(target_format) or ConverterFactory.get_converter(target_format)
     if not converter:
         return ConversionResult(
             success=False,
             error=f"Unsupported target format: {target_format}"
         )
     
-    # Set original model if provided
-    if hasattr(converter, 'set_original_model') and original_model:
-        converter.set_original_model(original_model)
-    
-    # Check for stream-specific method
-    if hasattr(converter, 'convert_streaming_chunk'):
-        return converter.convert_streaming_chunk(data, source_format)
-    else:
-        # Fallback to regular response conversion
-        return converter.convert_response(data, source_format, target_format)
+    # Every converter inherits convert_streaming_chunk from BaseConverter
+    return converter.convert_streaming_chunk(data, source_format, original_model)
 
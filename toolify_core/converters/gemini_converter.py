@@ -8,20 +8,74 @@ Gemini format converter.
 Handles Google Gemini API format conversions.
 """
 
-import json
-import time
-import uuid
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Mapping, Optional, Tuple
 import logging
 
-from .base_converter import BaseConverter, ConversionResult
+from .base_converter import BaseConverter, ConversionResult, EMPTY_MAPPING
+from ..json_codec import json_dumps, json_loads
 
 logger = logging.getLogger(__name__)
 
+# Finish-reason and role mappings, hoisted so they are not rebuilt per call
+_OPENAI_TO_GEMINI_FINISH = {
+    "stop": "STOP",
+    "length": "MAX_TOKENS",
+    "tool_calls": "STOP",
+    "content_filter": "SAFETY"
+}
+
+_ANTHROPIC_TO_GEMINI_FINISH = {
+    "end_turn": "STOP",
+    "max_tokens": "MAX_TOKENS",
+    "stop_sequence": "STOP",
+    "tool_use": "STOP"
+}
+
+_GEMINI_ROLE_TO_OPENAI = {"user": "user", "model": "assistant"}
+
+# Gemini generationConfig key -> OpenAI / Anthropic request parameter
+_GEMINI_TO_OPENAI_GEN = (
+    ("maxOutputTokens", "max_tokens"),
+    ("temperature", "temperature"),
+    ("topP", "top_p"),
+    ("stopSequences", "stop")
+)
+
+_GEMINI_TO_ANTHROPIC_GEN = (
+    ("maxOutputTokens", "max_tokens"),
+    ("temperature", "temperature"),
+    ("topP", "top_p"),
+    ("stopSequences", "stop_sequences")
+)
+
+# Immutable default for an OpenAI response without choices
+_EMPTY_CHOICES: Tuple[Mapping[str, Any], ...] = (EMPTY_MAPPING,)
+
+
+def _openai_choice(data: Dict[str, Any]) -> Tuple[Mapping[str, Any], Mapping[str, Any]]:
+    """Return (choices[0], choices[0].message) of an OpenAI response"""
+    choice = data.get("choices", _EMPTY_CHOICES)[0]
+    return choice, choice.get("message", EMPTY_MAPPING)
+
 
 class GeminiConverter(BaseConverter):
     """Converter for Google Gemini format"""
     
+    __slots__ = ("_req_dispatch", "_resp_dispatch")
+    
+    def __init__(self):
+        super().__init__()
+        # Format dispatch tables, built once so each call is a single dict lookup;
+        # same-format passthrough is handled before the lookup
+        self._req_dispatch = {
+            "openai": self._convert_to_openai_request,
+            "anthropic": self._convert_to_anthropic_request
+        }
+        self._resp_dispatch = {
+            "openai": self._convert_from_openai_response,
+            "anthropic": self._convert_from_anthropic_response
+        }
+    
     def get_format_name(self) -> str:
         return "gemini"
     
@@ -32,43 +86,40 @@ class GeminiConverter(BaseConverter):
         headers: Optional[Dict[str, str]] = None
     ) -> ConversionResult:
         """Convert Gemini request to target format"""
+        if target_format == self._format_name:
+            return ConversionResult.passthrough(data)
+        handler = self._req_dispatch.get(target_format)
+        if handler is None:
+            return ConversionResult(
+                success=False,
+                error=f"Unsupported target format: {target_format}"
+            )
         try:
-            if target_format == "gemini":
-                return ConversionResult(success=True, data=data)
-            elif target_format == "openai":
-                return self._convert_to_openai_request(data)
-            elif target_format == "anthropic":
-                return self._convert_to_anthropic_request(data)
-            else:
-                return ConversionResult(
-                    success=False,
-                    error=f"Unsupported target format: {target_format}"
-                )
+            return handler(data)
         except Exception as e:
-            logger.error(f"Request conversion failed: {e}")
+            logger.error("Request conversion failed: %s", e)
             return ConversionResult(success=False, error=str(e))
     
     def convert_response(
         self,
         data: Dict[str, Any],
         source_format: str,
-        target_format: str
+        target_format: str,
+        original_model: Optional[str] = None
     ) -> ConversionResult:
         """Convert response from source format to Gemini format"""
+        if source_format == self._format_name:
+            return ConversionResult.passthrough(data)
+        handler = self._resp_dispatch.get(source_format)
+        if handler is None:
+            return ConversionResult(
+                success=False,
+                error=f"Unsupported source format: {source_format}"
+            )
         try:
-            if source_format == "gemini":
-                return ConversionResult(success=True, data=data)
-            elif source_format == "openai":
-                return self._convert_from_openai_response(data)
-            elif source_format == "anthropic":
-                return self._convert_from_anthropic_response(data)
-            else:
-                return ConversionResult(
-                    success=False,
-                    error=f"Unsupported source format: {source_format}"
-                )
+            return handler(data, original_model or self.original_model)
         except Exception as e:
-            logger.error(f"Response conversion failed: {e}")
+            logger.error("Response conversion failed: %s", e)
             return ConversionResult(success=False, error=str(e))
     
     def _convert_to_openai_request(self, data: Dict) -> ConversionResult:
@@ -79,70 +130,67 @@ class GeminiConverter(BaseConverter):
             "stream": data.get("stream", False)
         }
         
+        messages = openai_req["messages"]
+        append_msg = messages.append
+        
         # Handle system instruction
         system_instruction = data.get("systemInstruction")
         if system_instruction:
             parts = system_instruction.get("parts", [])
             system_texts = [p.get("text", "") for p in parts if "text" in p]
             if system_texts:
-                openai_req["messages"].append({
+                append_msg({
                     "role": "system",
-                    "content": "\n".join(system_texts)
+                    "content": system_texts[0] if len(system_texts) == 1 else "\n".join(system_texts)
                 })
         
         # Convert contents to messages
         for content in data.get("contents", []):
             # Gemini uses "user" and "model", map to OpenAI's "user" and "assistant"
             # Default to "user" if role is not specified
-            gemini_role = content.get("role", "user")
-            role = "user" if gemini_role == "user" else "assistant"
-            parts = content.get("parts", [])
+            role = _GEMINI_ROLE_TO_OPENAI.get(content.get("role", "user"), "assistant")
             
-            # Extract text parts
+            # Single pass: function responses become tool messages ahead of the
+            # turn's text, which is collected into one message
             text_parts = []
-            for part in parts:
+            for part in content.get("parts", []):
                 if "text" in part:
                     text_parts.append(part["text"])
                 elif "functionResponse" in part:
-                    # Handle function response
                     func_resp = part["functionResponse"]
-                    openai_req["messages"].append({
+                    append_msg({
                         "role": "tool",
                         "tool_call_id": func_resp.get("name", ""),
-                        "content": json.dumps(func_resp.get("response", {}))
+                        "content": json_dumps(func_resp.get("response", {}))
                     })
             
             if text_parts:
-                openai_req["messages"].append({
+                append_msg({
                     "role": role,
-                    "content": "\n".join(text_parts)
+                    "content": text_parts[0] if len(text_parts) == 1 else "\n".join(text_parts)
                 })
         
         # Generation config
         gen_config = data.get("generationConfig", {})
-        if "maxOutputTokens" in gen_config:
-            openai_req["max_tokens"] = gen_config["maxOutputTokens"]
-        if "temperature" in gen_config:
-            openai_req["temperature"] = gen_config["temperature"]
-        if "topP" in gen_config:
-            openai_req["top_p"] = gen_config["topP"]
-        if "stopSequences" in gen_config:
-            openai_req["stop"] = gen_config["stopSequences"]
+        for src, dst in _GEMINI_TO_OPENAI_GEN:
+            if src in gen_config:
+                openai_req[dst] = gen_config[src]
         
         # Convert tools
-        if "tools" in data and data["tools"]:
-            openai_tools = []
-            for tool in data["tools"]:
-                func_declarations = tool.get("functionDeclarations", [])
-                for func_decl in func_declarations:
-                    openai_tools.append({
-                        "type": "function",
-                        "function": {
-                            "name": func_decl.get("name", ""),
-                            "description": func_decl.get("description", ""),
-                            "parameters": func_decl.get("parameters", {})
-                        }
-                    })
+        tools = data.get("tools")
+        if tools:
+            openai_tools = [
+                {
+                    "type": "function",
+                    "function": {
+                        "name": func_decl.get("name", ""),
+                        "description": func_decl.get("description", ""),
+                        "parameters": func_decl.get("parameters", {})
+                    }
+                }
+                for tool in tools
+                for func_decl in tool.get("functionDeclarations") or ()
+            ]
             if openai_tools:
                 openai_req["tools"] = openai_tools
         
@@ -163,25 +211,27 @@ class GeminiConverter(BaseConverter):
             parts = system_instruction.get("parts", [])
             system_texts = [p.get("text", "") for p in parts if "text" in p]
             if system_texts:
-                anthropic_req["system"] = "\n".join(system_texts)
+                anthropic_req["system"] = system_texts[0] if len(system_texts) == 1 else "\n".join(system_texts)
         
         # Convert contents to messages
+        msgs_append = anthropic_req["messages"].append
         for content in data.get("contents", []):
             role = content.get("role", "user")
             parts = content.get("parts", [])
             
             # Build content array
             content_array = []
+            append = content_array.append
             for part in parts:
                 if "text" in part:
-                    content_array.append({
+                    append({
                         "type": "text",
                         "text": part["text"]
                     })
                 elif "inline_data" in part:
                     # Handle image data
                     inline_data = part["inline_data"]
-                    content_array.append({
+                    append({
                         "type": "image",
                         "source": {
                             "type": "base64",
@@ -192,49 +242,44 @@ class GeminiConverter(BaseConverter):
                 elif "functionResponse" in part:
                     # Handle function response
                     func_resp = part["functionResponse"]
-                    content_array.append({
+                    append({
                         "type": "tool_result",
                         "tool_use_id": func_resp.get("name", ""),
-                        "content": json.dumps(func_resp.get("response", {}))
+                        "content": json_dumps(func_resp.get("response", {}))
                     })
             
             if content_array:
-                anthropic_req["messages"].append({
+                msgs_append({
                     "role": role,
                     "content": content_array if len(content_array) > 1 else content_array[0]["text"] if content_array[0].get("type") == "text" else content_array
                 })
         
         # Generation config
         gen_config = data.get("generationConfig", {})
-        if "maxOutputTokens" in gen_config:
-            anthropic_req["max_tokens"] = gen_config["maxOutputTokens"]
-        if "temperature" in gen_config:
-            anthropic_req["temperature"] = gen_config["temperature"]
-        if "topP" in gen_config:
-            anthropic_req["top_p"] = gen_config["topP"]
-        if "stopSequences" in gen_config:
-            anthropic_req["stop_sequences"] = gen_config["stopSequences"]
+        for src, dst in _GEMINI_TO_ANTHROPIC_GEN:
+            if src in gen_config:
+                anthropic_req[dst] = gen_config[src]
         
         # Convert tools
-        if "tools" in data and data["tools"]:
-            anthropic_tools = []
-            for tool in data["tools"]:
-                func_declarations = tool.get("functionDeclarations", [])
-                for func_decl in func_declarations:
-                    anthropic_tools.append({
-                        "name": func_decl.get("name", ""),
-                        "description": func_decl.get("description", ""),
-                        "input_schema": func_decl.get("parameters", {})
-                    })
+        tools = data.get("tools")
+        if tools:
+            anthropic_tools = [
+                {
+                    "name": func_decl.get("name", ""),
+                    "description": func_decl.get("description", ""),
+                    "input_schema": func_decl.get("parameters", {})
+                }
+                for tool in tools
+                for func_decl in tool.get("functionDeclarations") or ()
+            ]
             if anthropic_tools:
                 anthropic_req["tools"] = anthropic_tools
         
         return ConversionResult(success=True, data=anthropic_req)
     
-    def _convert_from_openai_response(self, data: Dict) -> ConversionResult:
+    def _convert_from_openai_response(self, data: Dict, original_model: Optional[str] = None) -> ConversionResult:
         """Convert OpenAI response to Gemini format"""
-        choice = data.get("choices", [{}])[0]
-        message = choice.get("message", {})
+        choice, message = _openai_choice(data)
         finish_reason = choice.get("finish_reason")
         
         # Build parts array
@@ -250,8 +295,8 @@ class GeminiConverter(BaseConverter):
                 if tool_call.get("type") == "function":
                     function = tool_call.get("function", {})
                     try:
-                        args = json.loads(function.get("arguments", "{}"))
-                    except json.JSONDecodeError:
+                        args = json_loads(function.get("arguments", "{}"))
+                    except ValueError:  # json.JSONDecodeError subclasses ValueError
                         args = {}
                     
                     parts.append({
@@ -262,16 +307,10 @@ class GeminiConverter(BaseConverter):
                     })
         
         # Map finish reason
-        finish_reason_map = {
-            "stop": "STOP",
-            "length": "MAX_TOKENS",
-            "tool_calls": "STOP",
-            "content_filter": "SAFETY"
-        }
-        gemini_finish_reason = finish_reason_map.get(finish_reason, "STOP")
+        gemini_finish_reason = _OPENAI_TO_GEMINI_FINISH.get(finish_reason, "STOP")
         
         # Token usage
-        usage = data.get("usage", {})
+        usage = data.get("usage", EMPTY_MAPPING)
         
         gemini_resp = {
             "candidates": [{
@@ -287,12 +326,12 @@ class GeminiConverter(BaseConverter):
                 "candidatesTokenCount": usage.get("completion_tokens", 0),
                 "totalTokenCount": usage.get("total_tokens", 0)
             },
-            "modelVersion": self.original_model or data.get("model", "")
+            "modelVersion": original_model or data.get("model", "")
         }
         
         return ConversionResult(success=True, data=gemini_resp)
     
-    def _convert_from_anthropic_response(self, data: Dict) -> ConversionResult:
+    def _convert_from_anthropic_response(self, data: Dict, original_model: Optional[str] = None) -> ConversionResult:
         """Convert Anthropic response to Gemini format"""
         content_blocks = data.get("content", [])
         
@@ -311,16 +350,10 @@ class GeminiConverter(BaseConverter):
         
         # Map stop reason
         stop_reason = data.get("stop_reason", "end_turn")
-        finish_reason_map = {
-            "end_turn": "STOP",
-            "max_tokens": "MAX_TOKENS",
-            "stop_sequence": "STOP",
-            "tool_use": "STOP"
-        }
-        gemini_finish_reason = finish_reason_map.get(stop_reason, "STOP")
+        gemini_finish_reason = _ANTHROPIC_TO_GEMINI_FINISH.get(stop_reason, "STOP")
         
         # Token usage
-        usage = data.get("usage", {})
+        usage = data.get("usage", EMPTY_MAPPING)
         
         gemini_resp = {
             "candidates": [{
@@ -339,7 +372,7 @@ class GeminiConverter(BaseConverter):
                     usage.get("output_tokens", 0)
                 )
             },
-            "modelVersion": self.original_model or data.get("model", "")
+            "modelVersion": original_model or data.get("model", "")
         }
         
         return ConversionResult(success=True, data=gemini_resp)
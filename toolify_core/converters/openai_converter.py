@@ -8,20 +8,63 @@ OpenAI format converter.
 Handles conversion from other formats to OpenAI format.
 """
 
-import json
 import time
-import uuid
 from typing import Dict, Any, Optional, List
 import logging
 
-from .base_converter import BaseConverter, ConversionResult
+from .base_converter import BaseConverter, ConversionResult, EMPTY_MAPPING, fast_uuid_hex
+from ..json_codec import json_dumps
 
 logger = logging.getLogger(__name__)
 
+# Finish-reason mappings, hoisted so they are not rebuilt per response
+_ANTHROPIC_TO_OPENAI_FINISH = {
+    "end_turn": "stop",
+    "max_tokens": "length",
+    "stop_sequence": "stop",
+    "tool_use": "tool_calls"
+}
+
+_GEMINI_TO_OPENAI_FINISH = {
+    "STOP": "stop",
+    "MAX_TOKENS": "length",
+    "SAFETY": "content_filter",
+    "RECITATION": "content_filter"
+}
+
+# OpenAI request parameter -> Anthropic request parameter / Gemini generationConfig key
+_OPENAI_TO_ANTHROPIC_PARAMS = (
+    ("temperature", "temperature"),
+    ("top_p", "top_p"),
+    ("stop", "stop_sequences")
+)
+
+_OPENAI_TO_GEMINI_GEN = (
+    ("max_tokens", "maxOutputTokens"),
+    ("temperature", "temperature"),
+    ("top_p", "topP"),
+    ("stop", "stopSequences")
+)
+
 
 class OpenAIConverter(BaseConverter):
     """Converter for OpenAI format"""
     
+    __slots__ = ("_req_dispatch", "_resp_dispatch")
+    
+    def __init__(self):
+        super().__init__()
+        # Format dispatch tables, built once so each call is a single dict lookup;
+        # same-format passthrough is handled before the lookup
+        self._req_dispatch = {
+            "anthropic": self._convert_to_anthropic_request,
+            "gemini": self._convert_to_gemini_request
+        }
+        self._resp_dispatch = {
+            "anthropic": self._convert_from_anthropic_response,
+            "gemini": self._convert_from_gemini_response
+        }
+    
     def get_format_name(self) -> str:
         return "openai"
     
@@ -36,47 +79,42 @@ class OpenAIConverter(BaseConverter):
         
         For OpenAI source, we convert TO other formats.
         """
+        if target_format == self._format_name:
+            return ConversionResult.passthrough(data)
+        handler = self._req_dispatch.get(target_format)
+        if handler is None:
+            return ConversionResult(
+                success=False,
+                error=f"Unsupported target format: {target_format}"
+            )
         try:
-            if target_format == "openai":
-                # No conversion needed
-                return ConversionResult(success=True, data=data)
-            elif target_format == "anthropic":
-                return self._convert_to_anthropic_request(data)
-            elif target_format == "gemini":
-                return self._convert_to_gemini_request(data)
-            else:
-                return ConversionResult(
-                    success=False,
-                    error=f"Unsupported target format: {target_format}"
-                )
+            return handler(data)
         except Exception as e:
-            logger.error(f"Request conversion failed: {e}")
+            logger.error("Request conversion failed: %s", e)
             return ConversionResult(success=False, error=str(e))
     
     def convert_response(
         self,
         data: Dict[str, Any],
         source_format: str,
-        target_format: str
+        target_format: str,
+        original_model: Optional[str] = None
     ) -> ConversionResult:
         """
         Convert response from source format to OpenAI format.
         """
+        if source_format == self._format_name:
+            return ConversionResult.passthrough(data)
+        handler = self._resp_dispatch.get(source_format)
+        if handler is None:
+            return ConversionResult(
+                success=False,
+                error=f"Unsupported source format: {source_format}"
+            )
         try:
-            if source_format == "openai":
-                # No conversion needed
-                return ConversionResult(success=True, data=data)
-            elif source_format == "anthropic":
-                return self._convert_from_anthropic_response(data)
-            elif source_format == "gemini":
-                return self._convert_from_gemini_response(data)
-            else:
-                return ConversionResult(
-                    success=False,
-                    error=f"Unsupported source format: {source_format}"
-                )
+            return handler(data, original_model or self.original_model)
         except Exception as e:
-            logger.error(f"Response conversion failed: {e}")
+            logger.error("Response conversion failed: %s", e)
             return ConversionResult(success=False, error=str(e))
     
     def _convert_to_anthropic_request(self, data: Dict) -> ConversionResult:
@@ -95,9 +133,10 @@ class OpenAIConverter(BaseConverter):
                 system_parts.append(msg.get("content", ""))
         
         if system_parts:
-            anthropic_req["system"] = "\n\n".join(system_parts)
+            anthropic_req["system"] = system_parts[0] if len(system_parts) == 1 else "\n\n".join(system_parts)
         
         # Convert messages
+        msgs_append = anthropic_req["messages"].append
         for msg in data.get("messages", []):
             if msg.get("role") == "system":
                 continue  # Already handled
@@ -109,7 +148,7 @@ class OpenAIConverter(BaseConverter):
             if role == "tool":
                 # Convert tool message to Anthropic format
                 tool_call_id = msg.get("tool_call_id")
-                anthropic_req["messages"].append({
+                msgs_append({
                     "role": "user",
                     "content": [{
                         "type": "tool_result",
@@ -118,30 +157,26 @@ class OpenAIConverter(BaseConverter):
                     }]
                 })
             else:
-                anthropic_req["messages"].append({
+                msgs_append({
                     "role": role,
                     "content": content
                 })
         
         # Convert tools
         if "tools" in data and data["tools"]:
-            anthropic_tools = []
-            for tool in data["tools"]:
-                func = tool.get("function", {})
-                anthropic_tools.append({
+            anthropic_req["tools"] = [
+                {
                     "name": func.get("name", ""),
                     "description": func.get("description", ""),
                     "input_schema": func.get("parameters", {})
-                })
-            anthropic_req["tools"] = anthropic_tools
+                }
+                for func in (tool.get("function", {}) for tool in data["tools"])
+            ]
         
         # Optional parameters
-        if "temperature" in data:
-            anthropic_req["temperature"] = data["temperature"]
-        if "top_p" in data:
-            anthropic_req["top_p"] = data["top_p"]
-        if "stop" in data:
-            anthropic_req["stop_sequences"] = data["stop"]
+        for src, dst in _OPENAI_TO_ANTHROPIC_PARAMS:
+            if src in data:
+                anthropic_req[dst] = data[src]
         
         return ConversionResult(success=True, data=anthropic_req)
     
@@ -159,10 +194,11 @@ class OpenAIConverter(BaseConverter):
         
         if system_parts:
             gemini_req["systemInstruction"] = {
-                "parts": [{"text": "\n\n".join(system_parts)}]
+                "parts": [{"text": system_parts[0] if len(system_parts) == 1 else "\n\n".join(system_parts)}]
             }
         
         # Convert messages to Gemini contents
+        contents_append = gemini_req["contents"].append
         for msg in data.get("messages", []):
             if msg.get("role") == "system":
                 continue
@@ -170,66 +206,61 @@ class OpenAIConverter(BaseConverter):
             role = "user" if msg.get("role") in ["user", "tool"] else "model"
             content = msg.get("content", "")
             
-            gemini_req["contents"].append({
+            contents_append({
                 "role": role,
                 "parts": [{"text": content}]
             })
         
         # Generation config
-        generation_config = {}
-        if "max_tokens" in data:
-            generation_config["maxOutputTokens"] = data["max_tokens"]
-        if "temperature" in data:
-            generation_config["temperature"] = data["temperature"]
-        if "top_p" in data:
-            generation_config["topP"] = data["top_p"]
-        if "stop" in data:
-            generation_config["stopSequences"] = data["stop"]
+        generation_config = {
+            dst: data[src] for src, dst in _OPENAI_TO_GEMINI_GEN if src in data
+        }
         
         if generation_config:
             gemini_req["generationConfig"] = generation_config
         
         # Convert tools
         if "tools" in data and data["tools"]:
-            gemini_tools = []
-            for tool in data["tools"]:
-                func = tool.get("function", {})
-                gemini_tools.append({
+            gemini_req["tools"] = [
+                {
                     "functionDeclarations": [{
                         "name": func.get("name", ""),
                         "description": func.get("description", ""),
                         "parameters": func.get("parameters", {})
                     }]
-                })
-            gemini_req["tools"] = gemini_tools
+                }
+                for func in (tool.get("function", {}) for tool in data["tools"])
+            ]
         
         return ConversionResult(success=True, data=gemini_req)
     
-    def _convert_from_anthropic_response(self, data: Dict) -> ConversionResult:
+    def _convert_from_anthropic_response(self, data: Dict, original_model: Optional[str] = None) -> ConversionResult:
         """Convert Anthropic response to OpenAI format"""
         # Build OpenAI message
         message = {"role": "assistant", "content": None}
         
         # Extract content
         content_blocks = data.get("content", [])
-        text_parts = []
-        tool_calls = []
-        
-        for block in content_blocks:
-            if block.get("type") == "text":
-                text_parts.append(block.get("text", ""))
-            elif block.get("type") == "tool_use":
-                tool_calls.append({
-                    "id": block.get("id", f"call_{uuid.uuid4().hex}"),
-                    "type": "function",
-                    "function": {
-                        "name": block.get("name", ""),
-                        "arguments": json.dumps(block.get("input", {}))
-                    }
-                })
+        text_parts = [
+            block.get("text", "") for block in content_blocks
+            if block.get("type") == "text"
+        ]
+        tool_calls = [
+            {
+                # Anthropic tool_use blocks carry their own id; only mint one if absent
+                "id": block["id"] if "id" in block else f"call_{fast_uuid_hex()}",
+                "type": "function",
+                "function": {
+                    "name": block.get("name", ""),
+                    "arguments": json_dumps(block.get("input", {}))
+                }
+            }
+            for block in content_blocks
+            if block.get("type") == "tool_use"
+        ]
         
         if text_parts:
-            message["content"] = "\n".join(text_parts)
+            message["content"] = text_parts[0] if len(text_parts) == 1 else "\n".join(text_parts)
         
         if tool_calls:
             message["tool_calls"] = tool_calls
@@ -238,37 +269,32 @@ class OpenAIConverter(BaseConverter):
         
         # Determine finish reason
         stop_reason = data.get("stop_reason", "stop")
-        finish_reason_map = {
-            "end_turn": "stop",
-            "max_tokens": "length",
-            "stop_sequence": "stop",
-            "tool_use": "tool_calls"
-        }
-        finish_reason = finish_reason_map.get(stop_reason, "stop")
+        finish_reason = _ANTHROPIC_TO_OPENAI_FINISH.get(stop_reason, "stop")
+        
+        usage = data.get("usage", EMPTY_MAPPING)
+        input_tokens = usage.get("input_tokens", 0)
+        output_tokens = usage.get("output_tokens", 0)
         
         openai_resp = {
-            "id": data.get("id", f"chatcmpl-{uuid.uuid4().hex}"),
+            "id": data["id"] if "id" in data else f"chatcmpl-{fast_uuid_hex()}",
             "object": "chat.completion",
             "created": int(time.time()),
-            "model": self.original_model or data.get("model", ""),
+            "model": original_model or data.get("model", ""),
             "choices": [{
                 "index": 0,
                 "message": message,
                 "finish_reason": finish_reason
             }],
             "usage": {
-                "prompt_tokens": data.get("usage", {}).get("input_tokens", 0),
-                "completion_tokens": data.get("usage", {}).get("output_tokens", 0),
-                "total_tokens": (
-                    data.get("usage", {}).get("input_tokens", 0) +
-                    data.get("usage", {}).get("output_tokens", 0)
-                )
+                "prompt_tokens": input_tokens,
+                "completion_tokens": output_tokens,
+                "total_tokens": input_tokens + output_tokens
             }
         }
         
         return ConversionResult(success=True, data=openai_resp)
     
-    def _convert_from_gemini_response(self, data: Dict) -> ConversionResult:
+    def _convert_from_gemini_response(self, data: Dict, original_model: Optional[str] = None) -> ConversionResult:
         """Convert Gemini response to OpenAI format"""
         candidates = data.get("candidates", [])
         if not candidates:
@@ -279,31 +305,29 @@ class OpenAIConverter(BaseConverter):
             )
         
         candidate = candidates[0]
-        content_data = candidate.get("content", {})
+        content_data = candidate.get("content", EMPTY_MAPPING)
         parts = content_data.get("parts", [])
         
-        # Extract text and function calls
-        text_parts = []
-        tool_calls = []
-        
-        for part in parts:
-            if "text" in part:
-                text_parts.append(part["text"])
-            elif "functionCall" in part:
-                func_call = part["functionCall"]
-                tool_calls.append({
-                    "id": f"call_{uuid.uuid4().hex}",
-                    "type": "function",
-                    "function": {
-                        "name": func_call.get("name", ""),
-                        "arguments": json.dumps(func_call.get("args", {}))
-                    }
-                })
+        # Extract text and function calls (a part carrying text is never a call)
+        text_parts = [part["text"] for part in parts if "text" in part]
+        tool_calls = [
+            {
+                "id": f"call_{fast_uuid_hex()}",
+                "type": "function",
+                "function": {
+                    "name": func_call.get("name", ""),
+                    "arguments": json_dumps(func_call.get("args", {}))
+                }
+            }
+            for part in parts
+            if "text" not in part and "functionCall" in part
+            for func_call in (part["functionCall"],)
+        ]
         
         # Build message
         message = {"role": "assistant"}
         if text_parts:
-            message["content"] = "\n".join(text_parts)
+            message["content"] = text_parts[0] if len(text_parts) == 1 else "\n".join(text_parts)
         else:
             message["content"] = None
         
@@ -311,23 +335,17 @@ class OpenAIConverter(BaseConverter):
             message["tool_calls"] = tool_calls
         
         # Determine finish reason
-        finish_reason_map = {
-            "STOP": "stop",
-            "MAX_TOKENS": "length",
-            "SAFETY": "content_filter",
-            "RECITATION": "content_filter"
-        }
         gemini_reason = candidate.get("finishReason", "STOP")
-        finish_reason = finish_reason_map.get(gemini_reason, "stop")
+        finish_reason = _GEMINI_TO_OPENAI_FINISH.get(gemini_reason, "stop")
         
         # Token usage
-        usage_metadata = data.get("usageMetadata", {})
+        usage_metadata = data.get("usageMetadata", EMPTY_MAPPING)
         
         openai_resp = {
-            "id": f"chatcmpl-{uuid.uuid4().hex}",
+            "id": f"chatcmpl-{fast_uuid_hex()}",
             "object": "chat.completion",
             "created": int(time.time()),
-            "model": self.original_model or data.get("modelVersion", ""),
+            "model": original_model or data.get("modelVersion", ""),
             "choices": [{
                 "index": 0,
                 "message": message,
@@ -7,37 +7,33 @@
 Prompt generation for function calling.
 """
 
-import json
 import secrets
-import string
 import logging
-from typing import List, Dict, Any, Tuple
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Tuple
+
+from ..json_codec import json_dumps, json_loads
 
 logger = logging.getLogger(__name__)
 
+# token_urlsafe draws from [A-Za-z0-9-_]; fold the two symbols back into letters
+# so the signal stays alphanumeric
+_URLSAFE_TO_ALNUM = str.maketrans("-_", "xZ")
 
-def generate_random_trigger_signal() -> str:
-    """Generate a random, self-closing trigger signal like <Function_AB1c_Start/>."""
-    chars = string.ascii_letters + string.digits
-    random_str = ''.join(secrets.choice(chars) for _ in range(4))
-    return f"<Function_{random_str}_Start/>"
+# JSON Schema keywords surfaced as "constraints" in parameter details, in display order
+_CONSTRAINT_KEYS = (
+    "minimum", "maximum", "exclusiveMinimum", "exclusiveMaximum",
+    "minLength", "maxLength", "pattern", "format",
+    "minItems", "maxItems", "uniqueItems"
+)
 
 
-def get_function_call_prompt_template(trigger_signal: str, custom_template: str = None) -> str:
-    """
-    Generate prompt template based on dynamic trigger signal.
-    """
-    if custom_template:
-        logger.info("🔧 Using custom prompt template from configuration")
-        return custom_template.format(
-            trigger_signal=trigger_signal,
-            tools_list="{tools_list}"
-        )
-    
-    return f"""
+# Default prompt body. Plain string, not an f-string: "{trigger_signal}" is filled
+# per call by joining _PROMPT_CHUNKS, "{tools_list}" later by generate_function_prompt.
+_PROMPT_SKELETON = """
 You have access to the following powerful tools to help solve problems efficiently:
 
-{{tools_list}}
+{tools_list}
 
 **🎯 CRITICAL TOOL USAGE RULES:**
 
@@ -93,7 +89,7 @@ Example 2 - Using CDATA (recommended for HTML/XML):
 <head>
   <title>Test</title>
   <style>
-    body {{ margin: 0; }}
+    body { margin: 0; }
   </style>
 </head>
 <body>
@@ -233,6 +229,43 @@ Your response:
 Now please be ready to strictly follow the above specifications and USE TOOLS PROACTIVELY!
 """
 
+# The skeleton split around every trigger-signal site, so rendering is a single join
+_PROMPT_CHUNKS: Tuple[str, ...] = tuple(_PROMPT_SKELETON.split("{trigger_signal}"))
+
+
+def generate_random_trigger_signal() -> str:
+    """Generate a random, self-closing trigger signal like <Function_AB1c_Start/>."""
+    random_str = secrets.token_urlsafe(3).translate(_URLSAFE_TO_ALNUM)
+    return f"<Function_{random_str}_Start/>"
+
+
+def _prompt_template(trigger_signal: str, custom_template: Optional[str]) -> str:
+    """Apply the trigger signal to the custom or default template, leaving {tools_list} in place."""
+    if custom_template:
+        return custom_template.format(
+            trigger_signal=trigger_signal,
+            tools_list="{tools_list}"
+        )
+    
+    return trigger_signal.join(_PROMPT_CHUNKS)
+
+
+def get_function_call_prompt_template(trigger_signal: str, custom_template: str = None) -> str:
+    """
+    Generate prompt template based on dynamic trigger signal.
+    """
+    if custom_template:
+        logger.info("🔧 Using custom prompt template from configuration")
+    return _prompt_template(trigger_signal, custom_template)
+
+
+def _function_key(func: Any) -> Tuple[str, Optional[str], str]:
+    """
+    Hashable key of the function fields that feed into the prompt. Parameters are
+    dumped without sort_keys, since property order shows up in the rendered prompt.
+    """
+    return (func.name, func.description, json_dumps(func.parameters))
+
 
 def generate_function_prompt(tools: List[Any], trigger_signal: str, custom_template: str = None) -> Tuple[str, str]:
     """
@@ -245,91 +278,91 @@ def generate_function_prompt(tools: List[Any], trigger_signal: str, custom_templ
     
     Returns: (prompt_content, trigger_signal)
     """
-    tools_list_str = []
-    for i, tool in enumerate(tools):
-        func = tool.function
-        name = func.name
-        description = func.description or ""
-
-        # Robustly read JSON Schema fields
-        schema: Dict[str, Any] = func.parameters or {}
-        props: Dict[str, Any] = schema.get("properties", {}) or {}
-        required_list: List[str] = schema.get("required", []) or []
-
-        # Brief summary line: name (type)
-        params_summary = ", ".join([
-            f"{p_name} ({(p_info or {}).get('type', 'any')})" for p_name, p_info in props.items()
-        ]) or "None"
-
-        # Build detailed parameter spec for prompt injection
-        detail_lines: List[str] = []
-        for p_name, p_info in props.items():
-            p_info = p_info or {}
-            p_type = p_info.get("type", "any")
-            is_required = "Yes" if p_name in required_list else "No"
-            p_desc = p_info.get("description")
-            enum_vals = p_info.get("enum")
-            default_val = p_info.get("default")
-            examples_val = p_info.get("examples") or p_info.get("example")
-
-            # Common constraints and hints
-            constraints: Dict[str, Any] = {}
-            for key in [
-                "minimum", "maximum", "exclusiveMinimum", "exclusiveMaximum",
-                "minLength", "maxLength", "pattern", "format",
-                "minItems", "maxItems", "uniqueItems"
-            ]:
-                if key in p_info:
-                    constraints[key] = p_info.get(key)
-
-            # Array item type hint
-            if p_type == "array":
-                items = p_info.get("items") or {}
-                if isinstance(items, dict):
-                    itype = items.get("type")
-                    if itype:
-                        constraints["items.type"] = itype
-
-            # Compose pretty lines
-            detail_lines.append(f"- {p_name}:")
-            detail_lines.append(f"  - type: {p_type}")
-            detail_lines.append(f"  - required: {is_required}")
-            if p_desc:
-                detail_lines.append(f"  - description: {p_desc}")
-            if enum_vals is not None:
-                try:
-                    detail_lines.append(f"  - enum: {json.dumps(enum_vals, ensure_ascii=False)}")
-                except Exception:
-                    detail_lines.append(f"  - enum: {enum_vals}")
-            if default_val is not None:
-                try:
-                    detail_lines.append(f"  - default: {json.dumps(default_val, ensure_ascii=False)}")
-                except Exception:
-                    detail_lines.append(f"  - default: {default_val}")
-            if examples_val is not None:
-                try:
-                    detail_lines.append(f"  - examples: {json.dumps(examples_val, ensure_ascii=False)}")
-                except Exception:
-                    detail_lines.append(f"  - examples: {examples_val}")
-            if constraints:
-                try:
-                    detail_lines.append(f"  - constraints: {json.dumps(constraints, ensure_ascii=False)}")
-                except Exception:
-                    detail_lines.append(f"  - constraints: {constraints}")
-
-        detail_block = "\n".join(detail_lines) if detail_lines else "(no parameter details)"
-        desc_block = f"```\n{description}\n```" if description else "None"
-
-        tools_list_str.append(
-            f"{i + 1}. <tool name=\"{name}\">\n"
-            f"   Description:\n{desc_block}\n"
-            f"   Parameters summary: {params_summary}\n"
-            f"   Required parameters: {', '.join(required_list) if required_list else 'None'}\n"
-            f"   Parameter details:\n{detail_block}"
-        )
-    
-    prompt_template = get_function_call_prompt_template(trigger_signal, custom_template)
-    prompt_content = prompt_template.replace("{tools_list}", "\n\n".join(tools_list_str))
-    
+    if custom_template:
+        logger.info("🔧 Using custom prompt template from configuration")
+    func_keys = tuple(_function_key(tool.function) for tool in tools)
+    prompt_content = _render_prompt(func_keys, trigger_signal, custom_template or None)
     return prompt_content, trigger_signal
 
+
+@lru_cache(maxsize=128)
+def _render_prompt(
+    func_keys: Tuple[Tuple[str, Optional[str], str], ...],
+    trigger_signal: str,
+    custom_template: Optional[str]
+) -> str:
+    """
+    Render the full prompt for a tool catalog. Clients resend the same catalog
+    every turn, so most requests are cache hits.
+    """
+    tools_list_str = [
+        f"{i + 1}. {_render_tool_block(*key)}" for i, key in enumerate(func_keys)
+    ]
+    prompt_template = _prompt_template(trigger_signal, custom_template)
+    return prompt_template.replace("{tools_list}", "\n\n".join(tools_list_str))
+
+
+# Keyed by _function_key, so a catalog that only gains or reorders tools still
+# reuses the blocks it already rendered
+@lru_cache(maxsize=1024)
+def _render_tool_block(name: str, description: Optional[str], parameters_json: str) -> str:
+    """Render one tool's prompt entry, without its list index."""
+    description = description or ""
+
+    # Robustly read JSON Schema fields
+    schema: Dict[str, Any] = json_loads(parameters_json) or {}
+    props: Dict[str, Any] = schema.get("properties", {}) or {}
+    required_list: List[str] = schema.get("required", []) or []
+    required_set = frozenset(required_list)
+
+    # One pass over the properties builds both the "name (type)" summary and the
+    # detailed parameter spec for prompt injection, one block per parameter
+    summary_parts: List[str] = []
+    detail_lines: List[str] = []
+    for p_name, p_info in props.items():
+        p_info = p_info or {}
+        p_type = p_info.get("type", "any")
+        summary_parts.append(f"{p_name} ({p_type})")
+        is_required = "Yes" if p_name in required_set else "No"
+        p_desc = p_info.get("description")
+        enum_vals = p_info.get("enum")
+        default_val = p_info.get("default")
+        examples_val = p_info.get("examples") or p_info.get("example")
+
+        # Common constraints and hints
+        constraints: Dict[str, Any] = {
+            key: p_info[key] for key in _CONSTRAINT_KEYS if key in p_info
+        }
+
+        # Array item type hint
+        if p_type == "array":
+            items = p_info.get("items") or {}
+            if isinstance(items, dict):
+                itype = items.get("type")
+                if itype:
+                    constraints["items.type"] = itype
+
+        parts = [f"- {p_name}:", f"  - type: {p_type}", f"  - required: {is_required}"]
+        if p_desc:
+            parts.append(f"  - description: {p_desc}")
+        if enum_vals is not None:
+            parts.append(f"  - enum: {json_dumps(enum_vals)}")
+        if default_val is not None:
+            parts.append(f"  - default: {json_dumps(default_val)}")
+        if examples_val is not None:
+            parts.append(f"  - examples: {json_dumps(examples_val)}")
+        if constraints:
+            parts.append(f"  - constraints: {json_dumps(constraints)}")
+        detail_lines.append("\n".join(parts))
+
+    params_summary = ", ".join(summary_parts) or "None"
+    detail_block = "\n".join(detail_lines) if detail_lines else "(no parameter details)"
+    desc_block = f"```\n{description}\n```" if description else "None"
+
+    return (
+        f"<tool name=\"{name}\">\n"
+        f"   Description:\n{desc_block}\n"
+        f"   Parameters summary: {params_summary}\n"
+        f"   Required parameters: {', '.join(required_list) if required_list else 'None'}\n"
+        f"   Parameter details:\n{detail_block}"
+    )
@@ -0,0 +1,66 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Toolify: Empower any LLM with function calling capabilities.
+# Copyright (C) 2025 FunnyCups (https://github.com/funnycups)
+
+"""
+Shared JSON encoding and decoding.
+
+Uses orjson when it is installed and the stdlib otherwise. Both paths produce the
+same compact, non-ASCII-escaped output, so results do not depend on which one is
+present. Inputs orjson cannot represent exactly fall back to the stdlib.
+"""
+
+import json
+import re
+from typing import Any, Union
+
+# 19+ digit runs may be integers outside orjson's exact range (below the i64
+# minimum or above the u64 maximum), which it rejects on encode and silently
+# turns into floats on decode
+_LONG_DIGITS = re.compile(r"\d{19}")
+_LONG_DIGITS_BYTES = re.compile(rb"\d{19}")
+
+
+def _std_dumps(obj: Any) -> str:
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+
+try:
+    import orjson
+except ImportError:  # required by requirements.txt; tolerated for bare source checkouts
+    orjson = None
+
+
+if orjson is not None:
+    def json_dumps(obj: Any) -> str:
+        """Serialize obj to a compact JSON string."""
+        try:
+            return orjson.dumps(obj).decode()
+        except TypeError:  # e.g. integers beyond 64 bits or non-str keys
+            return _std_dumps(obj)
+
+    def json_dumps_bytes(obj: Any) -> bytes:
+        """Serialize obj to compact UTF-8 JSON bytes."""
+        try:
+            return orjson.dumps(obj)
+        except TypeError:
+            return _std_dumps(obj).encode("utf-8")
+
+    def json_loads(data: Union[str, bytes]) -> Any:
+        """Parse a JSON document; raises ValueError on invalid input."""
+        pattern = _LONG_DIGITS_BYTES if isinstance(data, (bytes, bytearray)) else _LONG_DIGITS
+        if pattern.search(data) is None:
+            try:
+                return orjson.loads(data)
+            except ValueError:  # NaN/Infinity and other stdlib extensions
+                pass
+        return json.loads(data)
+else:
+    json_dumps = _std_dumps
+
+    def json_dumps_bytes(obj: Any) -> bytes:
+        """Serialize obj to compact UTF-8 JSON bytes."""
+        return _std_dumps(obj).encode("utf-8")
+
+    json_loads = json.loads
@@ -7,15 +7,15 @@
 Pydantic models for API requests and responses.
 """
 
-from typing import List, Dict, Any, Optional, Literal, Union
+from typing import Any, Literal
 from pydantic import BaseModel, ConfigDict
 
 
 class ToolFunction(BaseModel):
     """Function definition for a tool."""
     name: str
-    description: Optional[str] = None
-    parameters: Dict[str, Any]
+    description: str | None = None
+    parameters: dict[str, Any]
 
 
 class Tool(BaseModel):
@@ -29,16 +29,16 @@ class Message(BaseModel):
     model_config = ConfigDict(extra="allow")
     
     role: str
-    content: Optional[str] = None
-    tool_calls: Optional[List[Dict[str, Any]]] = None
-    tool_call_id: Optional[str] = None
-    name: Optional[str] = None
+    content: str | None = None
+    tool_calls: list[dict[str, Any]] | None = None
+    tool_call_id: str | None = None
+    name: str | None = None
 
 
 class ToolChoice(BaseModel):
     """Tool choice specification."""
     type: Literal["function"]
-    function: Dict[str, str]
+    function: dict[str, str]
 
 
 class ChatCompletionRequest(BaseModel):
@@ -46,18 +46,18 @@ class ChatCompletionRequest(BaseModel):
     model_config = ConfigDict(extra="allow")
     
     model: str
-    messages: List[Dict[str, Any]]
-    tools: Optional[List[Tool]] = None
-    tool_choice: Optional[Union[str, ToolChoice]] = None
-    stream: Optional[bool] = False
-    stream_options: Optional[Dict[str, Any]] = None
-    temperature: Optional[float] = None
-    max_tokens: Optional[int] = None
-    top_p: Optional[float] = None
-    frequency_penalty: Optional[float] = None
-    presence_penalty: Optional[float] = None
-    n: Optional[int] = None
-    stop: Optional[Union[str, List[str]]] = None
+    messages: list[dict[str, Any]]
+    tools: list[Tool] | None = None
+    tool_choice: str | ToolChoice | None = None
+    stream: bool | None = False
+    stream_options: dict[str, Any] | None = None
+    temperature: float | None = None
+    max_tokens: int | None = None
+    top_p: float | None = None
+    frequency_penalty: float | None = None
+    presence_penalty: float | None = None
+    n: int | None = None
+    stop: str | list[str] | None = None
 
 
 class AnthropicMessage(BaseModel):
@@ -65,16 +65,16 @@ class AnthropicMessage(BaseModel):
     model_config = ConfigDict(extra="allow")
     
     model: str
-    messages: List[Dict[str, Any]]
+    messages: list[dict[str, Any]]
     max_tokens: int = 4096  # Default to 4096 for better compatibility
-    system: Optional[Union[str, List[Dict[str, Any]]]] = None  # Can be string or array with cache_control
-    temperature: Optional[float] = None
-    top_p: Optional[float] = None
-    top_k: Optional[int] = None  # Anthropic specific
-    stream: Optional[bool] = False
-    stop_sequences: Optional[List[str]] = None
-    tools: Optional[List[Dict[str, Any]]] = None
-    metadata: Optional[Dict[str, Any]] = None  # For user_id tracking etc.
+    system: str | list[dict[str, Any]] | None = None  # Can be string or array with cache_control
+    temperature: float | None = None
+    top_p: float | None = None
+    top_k: int | None = None  # Anthropic specific
+    stream: bool | None = False
+    stop_sequences: list[str] | None = None
+    tools: list[dict[str, Any]] | None = None
+    metadata: dict[str, Any] | None = None  # For user_id tracking etc.
 
 
 class GeminiRequest(BaseModel):
@@ -82,10 +82,10 @@ class GeminiRequest(BaseModel):
     model_config = ConfigDict(extra="allow")
     
     model: str  # For internal use (not sent to Gemini API)
-    contents: List[Dict[str, Any]]
-    systemInstruction: Optional[Dict[str, Any]] = None
-    generationConfig: Optional[Dict[str, Any]] = None
-    tools: Optional[List[Dict[str, Any]]] = None
-    safetySettings: Optional[List[Dict[str, Any]]] = None
-    stream: Optional[bool] = False  # For internal routing (not sent in request body)
+    contents: list[dict[str, Any]]
+    systemInstruction: dict[str, Any] | None = None
+    generationConfig: dict[str, Any] | None = None
+    tools: list[dict[str, Any]] | None = None
+    safetySettings: list[dict[str, Any]] | None = None
+    stream: bool | None = False  # For internal routing (not sent in request body)
 
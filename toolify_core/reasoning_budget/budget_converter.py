@@ -8,11 +8,15 @@ Reasoning budget converter.
 Converts between OpenAI reasoning_effort levels and Anthropic/Gemini thinking token budgets.
 """
 
-from typing import Dict, Optional, Union
+from types import MappingProxyType
+from typing import Mapping
 import logging
 
 logger = logging.getLogger(__name__)
 
+# OpenAI effort levels, indexed by how many thresholds a token budget clears
+_EFFORT_LABELS = ("low", "medium", "high")
+
 
 class ReasoningBudgetConverter:
     """
@@ -22,35 +26,35 @@ class ReasoningBudgetConverter:
     Anthropic/Gemini use thinkingBudget: number of tokens
     """
     
-    # Default mappings (can be overridden in config)
-    DEFAULT_OPENAI_TO_ANTHROPIC = {
+    # Default mappings (can be overridden in config); read-only so instances can share them
+    DEFAULT_OPENAI_TO_ANTHROPIC = MappingProxyType({
         "low": 2048,
         "medium": 8192,
         "high": 16384
-    }
+    })
     
-    DEFAULT_OPENAI_TO_GEMINI = {
+    DEFAULT_OPENAI_TO_GEMINI = MappingProxyType({
         "low": 2048,
         "medium": 8192,
         "high": 16384
-    }
+    })
     
-    DEFAULT_ANTHROPIC_TO_OPENAI_THRESHOLDS = {
+    DEFAULT_ANTHROPIC_TO_OPENAI_THRESHOLDS = MappingProxyType({
         "low": 2048,      # tokens <= 2048 = low
         "high": 16384     # tokens >= 16384 = high, otherwise medium
-    }
+    })
     
-    DEFAULT_GEMINI_TO_OPENAI_THRESHOLDS = {
+    DEFAULT_GEMINI_TO_OPENAI_THRESHOLDS = MappingProxyType({
         "low": 2048,
         "high": 16384
-    }
+    })
     
     def __init__(
         self,
-        openai_to_anthropic_map: Optional[Dict[str, int]] = None,
-        openai_to_gemini_map: Optional[Dict[str, int]] = None,
-        anthropic_to_openai_thresholds: Optional[Dict[str, int]] = None,
-        gemini_to_openai_thresholds: Optional[Dict[str, int]] = None
+        openai_to_anthropic_map: Mapping[str, int] | None = None,
+        openai_to_gemini_map: Mapping[str, int] | None = None,
+        anthropic_to_openai_thresholds: Mapping[str, int] | None = None,
+        gemini_to_openai_thresholds: Mapping[str, int] | None = None
     ):
         """
         Initialize converter with custom mappings.
@@ -65,6 +69,27 @@ class ReasoningBudgetConverter:
         self._openai_to_gemini_map = openai_to_gemini_map or self.DEFAULT_OPENAI_TO_GEMINI
         self._anthropic_to_openai_thresholds = anthropic_to_openai_thresholds or self.DEFAULT_ANTHROPIC_TO_OPENAI_THRESHOLDS
         self._gemini_to_openai_thresholds = gemini_to_openai_thresholds or self.DEFAULT_GEMINI_TO_OPENAI_THRESHOLDS
+        
+        # Bound lookups for the per-request effort -> tokens conversions
+        self._openai_to_anthropic_get = self._openai_to_anthropic_map.get
+        self._openai_to_gemini_get = self._openai_to_gemini_map.get
+        
+        # Threshold bounds unpacked once for the token -> effort conversions
+        self._anthropic_low = self._anthropic_to_openai_thresholds["low"]
+        self._anthropic_high = self._anthropic_to_openai_thresholds["high"]
+        self._gemini_low = self._gemini_to_openai_thresholds["low"]
+        self._gemini_high = self._gemini_to_openai_thresholds["high"]
+        
+        # (source, target) -> conversion, so convert_reasoning_param is one dict lookup
+        self._dispatch = {
+            ("openai", "anthropic"): self.openai_to_anthropic,
+            ("openai", "gemini"): self.openai_to_gemini,
+            ("anthropic", "openai"): self.anthropic_to_openai,
+            ("gemini", "openai"): self.gemini_to_openai,
+            # Anthropic <-> Gemini: both are token budgets, mapped directly
+            ("anthropic", "gemini"): lambda v: v,
+            ("gemini", "anthropic"): lambda v: v
+        }
     
     def openai_to_anthropic(self, reasoning_effort: str) -> int:
         """
@@ -76,12 +101,16 @@ class ReasoningBudgetConverter:
         Returns:
             Number of thinking tokens for Anthropic
         """
-        tokens = self._openai_to_anthropic_map.get(reasoning_effort.lower())
+        get = self._openai_to_anthropic_get
+        # Clients almost always send lowercase levels; only normalize on a miss
+        tokens = get(reasoning_effort)
+        if tokens is None:
+            tokens = get(reasoning_effort.lower())
         if tokens is None:
-            logger.warning(f"Unknown reasoning_effort: {reasoning_effort}, using medium")
-            tokens = self._openai_to_anthropic_map.get("medium", 8192)
+            logger.warning("Unknown reasoning_effort: %s, using medium", reasoning_effort)
+            tokens = get("medium", 8192)
         
-        logger.debug(f"Converted OpenAI reasoning_effort '{reasoning_effort}' to Anthropic {tokens} tokens")
+        logger.debug("Converted OpenAI reasoning_effort '%s' to Anthropic %s tokens", reasoning_effort, tokens)
         return tokens
     
     def openai_to_gemini(self, reasoning_effort: str) -> int:
@@ -94,12 +123,16 @@ class ReasoningBudgetConverter:
         Returns:
             Number of thinking tokens for Gemini
         """
-        tokens = self._openai_to_gemini_map.get(reasoning_effort.lower())
+        get = self._openai_to_gemini_get
+        # Clients almost always send lowercase levels; only normalize on a miss
+        tokens = get(reasoning_effort)
         if tokens is None:
-            logger.warning(f"Unknown reasoning_effort: {reasoning_effort}, using medium")
-            tokens = self._openai_to_gemini_map.get("medium", 8192)
+            tokens = get(reasoning_effort.lower())
+        if tokens is None:
+            logger.warning("Unknown reasoning_effort: %s, using medium", reasoning_effort)
+            tokens = get("medium", 8192)
         
-        logger.debug(f"Converted OpenAI reasoning_effort '{reasoning_effort}' to Gemini {tokens} tokens")
+        logger.debug("Converted OpenAI reasoning_effort '%s' to Gemini %s tokens", reasoning_effort, tokens)
         return tokens
     
     def anthropic_to_openai(self, thinking_budget: int) -> str:
@@ -112,14 +145,12 @@ class ReasoningBudgetConverter:
         Returns:
             OpenAI effort level ("low", "medium", "high")
         """
-        if thinking_budget <= self._anthropic_to_openai_thresholds["low"]:
-            effort = "low"
-        elif thinking_budget >= self._anthropic_to_openai_thresholds["high"]:
-            effort = "high"
-        else:
-            effort = "medium"
+        # <= low -> 0, >= high -> 2, otherwise 1; "low" wins if the bounds overlap
+        effort = _EFFORT_LABELS[
+            (thinking_budget > self._anthropic_low) * (1 + (thinking_budget >= self._anthropic_high))
+        ]
         
-        logger.debug(f"Converted Anthropic {thinking_budget} tokens to OpenAI reasoning_effort '{effort}'")
+        logger.debug("Converted Anthropic %s tokens to OpenAI reasoning_effort '%s'", thinking_budget, effort)
         return effort
     
     def gemini_to_openai(self, thinking_budget: int) -> str:
@@ -132,22 +163,20 @@ class ReasoningBudgetConverter:
         Returns:
             OpenAI effort level ("low", "medium", "high")
         """
-        if thinking_budget <= self._gemini_to_openai_thresholds["low"]:
-            effort = "low"
-        elif thinking_budget >= self._gemini_to_openai_thresholds["high"]:
-            effort = "high"
-        else:
-            effort = "medium"
+        # <= low -> 0, >= high -> 2, otherwise 1; "low" wins if the bounds overlap
+        effort = _EFFORT_LABELS[
+            (thinking_budget > self._gemini_low) * (1 + (thinking_budget >= self._gemini_high))
+        ]
         
-        logger.debug(f"Converted Gemini {thinking_budget} tokens to OpenAI reasoning_effort '{effort}'")
+        logger.debug("Converted Gemini %s tokens to OpenAI reasoning_effort '%s'", thinking_budget, effort)
         return effort
     
     def convert_reasoning_param(
         self,
         source_format: str,
         target_format: str,
-        value: Union[str, int]
-    ) -> Optional[Union[str, int]]:
+        value: str | int
+    ) -> str | int | None:
         """
         Universal converter that handles any direction.
         
@@ -162,31 +191,16 @@ class ReasoningBudgetConverter:
         if source_format == target_format:
             return value
         
-        # OpenAI -> Others
-        if source_format == "openai":
-            if target_format == "anthropic":
-                return self.openai_to_anthropic(value)
-            elif target_format == "gemini":
-                return self.openai_to_gemini(value)
-        
-        # Others -> OpenAI
-        elif target_format == "openai":
-            if source_format == "anthropic":
-                return self.anthropic_to_openai(value)
-            elif source_format == "gemini":
-                return self.gemini_to_openai(value)
-        
-        # Anthropic <-> Gemini (direct token mapping)
-        elif source_format in ["anthropic", "gemini"] and target_format in ["anthropic", "gemini"]:
-            # Direct token-to-token mapping
-            return value
+        convert = self._dispatch.get((source_format, target_format))
+        if convert is not None:
+            return convert(value)
         
-        logger.warning(f"Unsupported conversion: {source_format} -> {target_format}")
+        logger.warning("Unsupported conversion: %s -> %s", source_format, target_format)
         return None
 
 
 # Global converter instance
-_global_converter: Optional[ReasoningBudgetConverter] = None
+_global_converter: ReasoningBudgetConverter | None = None
 
 
 def get_global_converter() -> ReasoningBudgetConverter: